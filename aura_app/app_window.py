@@ -85,7 +85,7 @@ class StatsWorker(QObject):
             stats = db.get_stats()
             photos_by_status = stats.get("photos_by_status", {})
             upload_stats = db.get_upload_stats_unique()
-            persons = db.get_all_persons()
+            persons = db.get_all_persons_meta()
             enrollments = {e.person_id: e for e in db.get_all_enrollments()}
             pinned_ids = set(db.get_pinned_person_ids())
 
@@ -104,7 +104,6 @@ def _get_person_sample_photos(person_id, max_photos=6):
             (person_id, max_photos)
         )
         rows = cursor.fetchall()
-        conn.commit()
         return [row[0] for row in rows if row[0] and Path(row[0]).exists()]
     except Exception:
         return []
@@ -604,7 +603,7 @@ class ClusterMergeDialog(QDialog):
         """Load persons from the database into both dropdowns."""
         try:
             db = _get_db()
-            persons = db.get_all_persons()
+            persons = db.get_all_persons_meta()
             enrollments = {e.person_id: e for e in db.get_all_enrollments()}
 
             self.keep_card.populate(persons, enrollments)
@@ -518,8 +518,6 @@ class SelfHealingDialog(QDialog):
             else:
                 results["wal_size"] = 0.0
 
-            conn.commit()
-
         except Exception as e:
             results["error"] = str(e)
 
@@ -734,9 +732,8 @@ class SelfHealingDialog(QDialog):
                         """UPDATE upload_queue 
                            SET status = 'pending', retry_count = 0, 
                                last_error = 'Reset by self-healing repair',
-                               updated_at = ?
-                           WHERE status = 'failed' AND retry_count >= 5""",
-                        (datetime.now(),)
+                               updated_at = CURRENT_TIMESTAMP
+                           WHERE status = 'failed' AND retry_count >= 5"""
                     )
                     fixed_count = cursor.rowcount
 
@@ -745,8 +742,6 @@ class SelfHealingDialog(QDialog):
                 conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
                 fixed_count = 1
 
-            conn.commit()
-
         except Exception as e:
             fixed_count = -1
             error_msg = str(e)
@@ -888,16 +883,13 @@ class SelfHealingDialog(QDialog):
                         """UPDATE upload_queue 
                            SET status = 'pending', retry_count = 0,
                                last_error = 'Reset by self-healing repair',
-                               updated_at = ?
-                           WHERE status = 'failed' AND retry_count >= 5""",
-                        (datetime.now(),)
+                               updated_at = CURRENT_TIMESTAMP
+                           WHERE status = 'failed' AND retry_count >= 5"""
                     )
 
             elif issue_key == "wal_size":
                 conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
 
-            conn.commit()
-
         except Exception:
             pass  # Individual repairs may fail silently in fix-all mode
 
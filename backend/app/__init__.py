@@ -1,4 +1,19 @@
 # AURA - Phase 2 Backend (by DARK intelligence)
 
-from .enrollment import enroll_user, EnrollmentResult, get_enrollment_status
-from .db import Enrollment
+# The public names are resolved on first use, so importing a light submodule
+# (e.g. the enroll_cli --socket client) doesn't pull in the detector stack.
+_EXPORTS = {
+    "enroll_user": ".enrollment",
+    "EnrollmentResult": ".enrollment",
+    "get_enrollment_status": ".enrollment",
+    "Enrollment": ".db",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -37,6 +37,34 @@ def euclidean_distance(a: np.ndarray, b: np.ndarray) -> float:
     return float(np.linalg.norm(a - b))
 
 
+def find_nearest_centroid(
+    embedding: np.ndarray,
+    centroids: np.ndarray,
+    normalized: bool = False
+) -> Tuple[int, float]:
+    """
+    Find the row of a centroid matrix nearest to a given embedding.
+    Computes all cosine distances with one matrix-vector product.
+    Pass normalized=True when the embedding and every row are already unit
+    length (as from Database.get_all_centroids()) to skip the norms.
+    Returns (row_index, distance) or (-1, inf) if the matrix is empty.
+    """
+    if len(centroids) == 0:
+        return -1, float("inf")
+    
+    dots = centroids @ embedding
+    if normalized:
+        similarity = dots
+    else:
+        norms = np.linalg.norm(centroids, axis=1) * np.linalg.norm(embedding)
+        # Zero vectors get similarity -1, i.e. the maximum distance of 2
+        similarity = np.divide(dots, norms, out=np.full(len(centroids), -1.0), where=norms > 0)
+    distances = 1.0 - np.clip(similarity, -1.0, 1.0)
+    
+    index = int(np.argmin(distances))
+    return index, float(distances[index])
+
+
 def find_nearest_person(
     embedding: np.ndarray,
     persons: list[Person]
@@ -48,16 +76,9 @@ def find_nearest_person(
     if not persons:
         return None, float("inf")
     
-    min_distance = float("inf")
-    nearest_person = None
-    
-    for person in persons:
-        distance = cosine_distance(embedding, person.centroid)
-        if distance < min_distance:
-            min_distance = distance
-            nearest_person = person
-    
-    return nearest_person, min_distance
+    centroids = np.stack([person.centroid for person in persons])
+    index, distance = find_nearest_centroid(embedding, centroids)
+    return persons[index], distance
 
 
 def update_centroid(
@@ -108,11 +129,10 @@ def assign_person(
     if norm > 0:
         embedding = embedding / norm
     
-    # Get all existing persons
-    persons = db.get_all_persons()
-    
-    # Find nearest person
-    nearest_person, distance = find_nearest_person(embedding, persons)
+    # Find the nearest person among all existing centroids
+    centroids, person_ids = db.get_all_centroids()
+    index, distance = find_nearest_centroid(embedding, centroids, normalized=True)
+    nearest_person = db.get_person_by_id(person_ids[index]) if index >= 0 else None
     
     if nearest_person is not None and distance < threshold:
         # Assign to existing person
@@ -131,12 +151,9 @@ def assign_person(
         
         return nearest_person.id
     else:
-        # Create new person
-        next_num = db.get_next_person_number()
-        person_name = f"Person_{next_num:03d}"
-        
-        person_id = db.create_person(person_name, embedding)
-        logger.info(f"Created new person: {person_name} (ID: {person_id})")
+        # Create new person (named Person_XXX after its ID by the database)
+        person_id = db.create_person(None, embedding)
+        logger.info(f"Created new person: Person_{person_id:03d} (ID: {person_id})")
         
         return person_id
 
@@ -171,7 +188,7 @@ def cluster_faces(
 def get_cluster_stats() -> dict:
     """Get statistics about the current clusters."""
     db = get_db()
-    persons = db.get_all_persons()
+    persons = db.get_all_persons_meta()
     
     if not persons:
         return {
@@ -221,17 +238,16 @@ def merge_persons(person_id_keep: int, person_id_remove: int) -> bool:
     if norm > 0:
         new_centroid = new_centroid / norm
     
-    # Update the kept person
-    db.update_person_centroid(person_id_keep, new_centroid, total_count)
-    
-    # Reassign all faces from removed person
-    conn = db.connect()
-    conn.execute(
-        "UPDATE faces SET person_id = ? WHERE person_id = ?",
-        (person_id_keep, person_id_remove)
-    )
-    conn.execute("DELETE FROM persons WHERE id = ?", (person_id_remove,))
-    conn.commit()
+    with db.transaction() as conn:
+        # Update the kept person
+        db.update_person_centroid(person_id_keep, new_centroid, total_count)
+        
+        # Reassign all faces from removed person
+        conn.execute(
+            "UPDATE faces SET person_id = ? WHERE person_id = ?",
+            (person_id_keep, person_id_remove)
+        )
+        db.delete_person(person_id_remove)
     
     logger.info(
         f"Merged Person_{person_id_remove:03d} into Person_{person_id_keep:03d} "
@@ -43,6 +43,7 @@ class Config:
     cluster_threshold: float
     max_image_size: int
     thumbnail_size: int
+    thumbnail_filter: str  # "area" (OpenCV) or a Pillow resampling filter name, e.g. bicubic
     
     # Watcher
     scan_interval: int
@@ -111,6 +112,7 @@ class Config:
             cluster_threshold=float(os.getenv("CLUSTER_THRESHOLD", "0.6")),
             max_image_size=int(os.getenv("MAX_IMAGE_SIZE", "2048")),
             thumbnail_size=int(os.getenv("THUMBNAIL_SIZE", "300")),
+            thumbnail_filter=os.getenv("THUMBNAIL_FILTER", "area").lower(),
             scan_interval=int(os.getenv("SCAN_INTERVAL", "30")),
             supported_extensions=extensions,
             dry_run=os.getenv("DRY_RUN", "false").lower() == "true",
@@ -2,62 +2,117 @@
 Database module for AURA Phase 2 Backend (by DARK intelligence).
 
 SQLite schema and queries for tracking photos, faces, and person clusters.
+Requires SQLite 3.35+ (RETURNING, ALTER TABLE ... DROP COLUMN).
 """
 
+import os
 import sqlite3
 import pickle
 import threading
 import logging
-import time
-import functools
+import queue
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Tuple
+from typing import Iterator, Optional, List, Tuple
 from dataclasses import dataclass
 import numpy as np
 
 from .config import get_config
 
+try:
+    import blosc2
+except ImportError:  # Optional: embeddings are stored uncompressed without it
+    blosc2 = None
+
 logger = logging.getLogger(__name__)
 
+# Prefix marking an embedding BLOB as Blosc-compressed (raw float32 otherwise)
+_BLOSC_MAGIC = b"BLS2"
+
 
-def retry_on_lock(max_retries=5, initial_delay=1.0, backoff_factor=2.0):
+def _emb_to_blob(embedding: np.ndarray) -> bytes:
+    """Serialize an embedding/centroid vector to a float32 BLOB.
+    
+    When blosc2 is installed the vector is byte-shuffled and LZ4-compressed,
+    but the compressed form is only kept if it is actually smaller than the
+    raw float32 bytes.
     """
-    Decorator to retry database operations on 'database is locked' errors.
+    raw = np.ascontiguousarray(embedding, dtype=np.float32).tobytes()
+    if blosc2 is None:
+        return raw
+    packed = _BLOSC_MAGIC + blosc2.compress2(
+        raw,
+        typesize=4,
+        codec=blosc2.Codec.LZ4,
+        filters=[blosc2.Filter.BITSHUFFLE],
+    )
+    return packed if len(packed) < len(raw) else raw
+
+
+def _blob_to_emb(blob: bytes) -> np.ndarray:
+    """Deserialize a float32 BLOB (raw or Blosc-compressed) into a vector."""
+    if blob[:4] == _BLOSC_MAGIC:
+        if blosc2 is None:
+            raise RuntimeError(
+                "Database contains compressed embeddings. Please install blosc2: pip install blosc2"
+            )
+        blob = blosc2.decompress2(blob[4:])
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row of a float32 matrix in place (zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+# Columns selected as '<col> AS "<col> [embedding]"' come back as numpy vectors
+# on connections opened with detect_types=PARSE_COLNAMES
+sqlite3.register_converter("embedding", _blob_to_emb)
+
+
+def _is_legacy_pickle(blob: bytes) -> bool:
+    """Check whether a BLOB was written by the old pickle-based serializer.
     
-    Args:
-        max_retries (int): Maximum number of retries.
-        initial_delay (float): Initial delay in seconds before first retry.
-        backoff_factor (float): Multiplier for delay after each retry.
+    Pickle protocol 2+ streams start with the PROTO opcode (0x80) followed by
+    the protocol number, and always end with the STOP opcode ('.').
     """
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            delay = initial_delay
-            last_exception = None
-            
-            for attempt in range(max_retries + 1):
-                try:
-                    return func(*args, **kwargs)
-                except sqlite3.OperationalError as e:
-                    if "database is locked" in str(e):
-                        last_exception = e
-                        if attempt < max_retries:
-                            logger.warning(
-                                f"Database locked in {func.__name__}, retrying "
-                                f"({attempt + 1}/{max_retries}) in {delay:.2f}s..."
-                            )
-                            time.sleep(delay)
-                            delay *= backoff_factor
-                        else:
-                            logger.error(f"Database locked in {func.__name__}, max retries reached.")
-                    else:
-                        raise e
-            
-            if last_exception:
-                raise last_exception
-        return wrapper
-    return decorator
+    return (
+        len(blob) > 2
+        and blob[0] == 0x80
+        and 2 <= blob[1] <= 5
+        and blob[-1:] == b"."
+    )
+
+
+def _pack_bbox(bbox: Tuple[int, int, int, int]) -> int:
+    """Pack an (x, y, w, h) bounding box into one 64-bit integer.
+    
+    Each field gets 16 bits, stored as (x<<48) | (y<<32) | (w<<16) | h. x and y
+    may be slightly negative for faces cut off at the image edge, so fields are
+    kept as signed 16-bit values and the result stays within SQLite's INTEGER range.
+    """
+    x, y, w, h = (int(v) for v in bbox)
+    for value in (x, y, w, h):
+        if not -0x8000 <= value < 0x8000:
+            raise ValueError(f"Bounding box value out of 16-bit range: {bbox}")
+    return (x << 48) | ((y & 0xFFFF) << 32) | ((w & 0xFFFF) << 16) | (h & 0xFFFF)
+
+
+def _unpack_bbox(packed: int) -> Tuple[int, int, int, int]:
+    """Unpack a bounding box written by _pack_bbox() into (x, y, w, h)."""
+    def signed16(value: int) -> int:
+        return value - 0x10000 if value & 0x8000 else value
+    
+    return (
+        packed >> 48,
+        signed16((packed >> 32) & 0xFFFF),
+        signed16((packed >> 16) & 0xFFFF),
+        signed16(packed & 0xFFFF),
+    )
 
 
 @dataclass
@@ -98,6 +153,28 @@ class Person:
     created_at: datetime
 
 
+@dataclass
+class FaceSummary:
+    """Face record without its embedding, for callers that only need metadata."""
+    id: int
+    photo_id: int
+    person_id: Optional[int]
+    bbox_x: int
+    bbox_y: int
+    bbox_w: int
+    bbox_h: int
+    confidence: float
+
+
+@dataclass
+class PersonSummary:
+    """Person cluster without its centroid, for listing and counting."""
+    id: int
+    name: str
+    face_count: int
+    created_at: datetime
+
+
 @dataclass
 class Enrollment:
     """Represents an enrolled user in the database."""
@@ -131,10 +208,7 @@ CREATE TABLE IF NOT EXISTS faces (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     photo_id INTEGER NOT NULL REFERENCES photos(id) ON DELETE CASCADE,
     person_id INTEGER REFERENCES persons(id),
-    bbox_x INTEGER NOT NULL,
-    bbox_y INTEGER NOT NULL,
-    bbox_w INTEGER NOT NULL,
-    bbox_h INTEGER NOT NULL,
+    bbox INTEGER NOT NULL,  -- packed (x, y, w, h), see _pack_bbox()
     embedding BLOB NOT NULL,
     confidence REAL NOT NULL
 );
@@ -181,16 +255,127 @@ CREATE TABLE IF NOT EXISTS vip_pins (
     pinned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Row counters kept current by the triggers below, so stats polling
+-- doesn't have to COUNT(*) whole tables
+CREATE TABLE IF NOT EXISTS stats_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_faces_count_insert AFTER INSERT ON faces
+BEGIN UPDATE stats_counters SET value = value + 1 WHERE name = 'faces'; END;
+CREATE TRIGGER IF NOT EXISTS trg_faces_count_delete AFTER DELETE ON faces
+BEGIN UPDATE stats_counters SET value = value - 1 WHERE name = 'faces'; END;
+CREATE TRIGGER IF NOT EXISTS trg_persons_count_insert AFTER INSERT ON persons
+BEGIN UPDATE stats_counters SET value = value + 1 WHERE name = 'persons'; END;
+CREATE TRIGGER IF NOT EXISTS trg_persons_count_delete AFTER DELETE ON persons
+BEGIN UPDATE stats_counters SET value = value - 1 WHERE name = 'persons'; END;
+CREATE TRIGGER IF NOT EXISTS trg_enrollments_count_insert AFTER INSERT ON enrollments
+BEGIN UPDATE stats_counters SET value = value + 1 WHERE name = 'enrollments'; END;
+CREATE TRIGGER IF NOT EXISTS trg_enrollments_count_delete AFTER DELETE ON enrollments
+BEGIN UPDATE stats_counters SET value = value - 1 WHERE name = 'enrollments'; END;
+
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_photos_status ON photos(status);
 CREATE INDEX IF NOT EXISTS idx_photos_hash ON photos(file_hash);
 CREATE INDEX IF NOT EXISTS idx_faces_photo ON faces(photo_id);
-CREATE INDEX IF NOT EXISTS idx_faces_person ON faces(person_id);
-CREATE INDEX IF NOT EXISTS idx_enrollments_person ON enrollments(person_id);
-CREATE INDEX IF NOT EXISTS idx_upload_queue_status ON upload_queue(status);
+CREATE INDEX IF NOT EXISTS idx_faces_person_photo ON faces(person_id, photo_id);
+CREATE UNIQUE INDEX IF NOT EXISTS uniq_enrollments_person ON enrollments(person_id);
+CREATE INDEX IF NOT EXISTS idx_upload_queue_status_created ON upload_queue(status, created_at);
 CREATE INDEX IF NOT EXISTS idx_upload_queue_photo ON upload_queue(photo_id);
+CREATE INDEX IF NOT EXISTS idx_upload_queue_local_path ON upload_queue(local_path);
+
+-- Partial indexes for the periodic stuck-row resets; they only hold rows
+-- that are mid-flight, so they stay tiny however large the tables grow
+CREATE INDEX IF NOT EXISTS idx_photos_processing_created ON photos(status, created_at)
+    WHERE status = 'processing';
+CREATE INDEX IF NOT EXISTS idx_upload_queue_uploading_updated ON upload_queue(status, updated_at)
+    WHERE status = 'uploading';
+
+-- Superseded by the compound indexes above (same leading column)
+DROP INDEX IF EXISTS idx_faces_person;
+DROP INDEX IF EXISTS idx_enrollments_person;
+DROP INDEX IF EXISTS idx_upload_queue_status;
 """
 
+# Explicit column lists so reads never pull more than the dataclass needs
+PHOTO_COLUMNS = (
+    "id, file_hash, original_path, processed_path, thumbnail_path, "
+    "status, face_count, created_at, processed_at"
+)
+FACE_META_COLUMNS = "id, photo_id, person_id, bbox, confidence"
+# The "[embedding]" column-name tag makes sqlite3 decode vectors during fetch
+FACE_COLUMNS = FACE_META_COLUMNS + ', embedding AS "embedding [embedding]"'
+PERSON_META_COLUMNS = "id, name, face_count, created_at"
+PERSON_COLUMNS = PERSON_META_COLUMNS + ', centroid AS "centroid [embedding]"'
+
+# Hot-path and periodically polled statements. sqlite3's per-connection cache
+# is keyed on the exact SQL text, so these must stay byte-identical between
+# calls (no f-strings or reformatting) to reuse one prepared statement instead
+# of re-parsing. Queries built from the column lists are formatted once here
+# rather than per call.
+GET_PHOTO_BY_ID_SQL = f"SELECT {PHOTO_COLUMNS} FROM photos WHERE id = ?"
+GET_PHOTO_BY_HASH_SQL = f"SELECT {PHOTO_COLUMNS} FROM photos WHERE file_hash = ?"
+GET_PENDING_BATCH_SQL = f"""SELECT {PHOTO_COLUMNS} FROM photos
+                            WHERE status = 'pending' AND id > ?
+                            ORDER BY id
+                            LIMIT ?"""
+PHOTO_EXISTS_SQL = "SELECT 1 FROM photos WHERE file_hash = ? LIMIT 1"
+GET_FACES_BY_PHOTO_SQL = f"SELECT {FACE_COLUMNS} FROM faces WHERE photo_id = ?"
+GET_FACES_BY_PHOTO_META_SQL = f"SELECT {FACE_META_COLUMNS} FROM faces WHERE photo_id = ?"
+GET_ALL_PERSONS_SQL = f"SELECT {PERSON_COLUMNS} FROM persons ORDER BY id"
+GET_ALL_PERSONS_META_SQL = f"SELECT {PERSON_META_COLUMNS} FROM persons ORDER BY id"
+GET_ALL_CENTROIDS_SQL = "SELECT id, centroid FROM persons ORDER BY id"
+GET_PERSON_BY_ID_SQL = f"SELECT {PERSON_COLUMNS} FROM persons WHERE id = ?"
+INSERT_FACE_SQL = """INSERT INTO faces (photo_id, person_id, bbox, embedding, confidence)
+                     VALUES (?, ?, ?, ?, ?)"""
+UPDATE_FACE_PERSON_SQL = "UPDATE faces SET person_id = ? WHERE id = ?"
+UPDATE_PERSON_CENTROID_SQL = "UPDATE persons SET centroid = ?, face_count = ? WHERE id = ?"
+UPDATE_UPLOAD_STATUS_SQL = """UPDATE upload_queue 
+                              SET status = ?, last_error = ?, updated_at = CURRENT_TIMESTAMP
+                              WHERE id = ?"""
+UPDATE_UPLOAD_STATUS_RETRY_SQL = """UPDATE upload_queue 
+                                    SET status = ?, last_error = ?, retry_count = retry_count + 1, updated_at = CURRENT_TIMESTAMP
+                                    WHERE id = ?"""
+# Claims a batch of pending uploads in one statement, so the select and the
+# status change can't be separated by another claimer
+CLAIM_PENDING_UPLOADS_SQL = """UPDATE upload_queue
+                               SET status = 'uploading', updated_at = CURRENT_TIMESTAMP
+                               WHERE id IN (SELECT id FROM upload_queue
+                                            WHERE status = 'pending'
+                                            ORDER BY created_at
+                                            LIMIT ?)
+                               RETURNING *"""
+RESET_STUCK_UPLOADS_SQL = """UPDATE upload_queue 
+                             SET status = 'pending', last_error = 'Reset: stuck in uploading', updated_at = CURRENT_TIMESTAMP
+                             WHERE status = 'uploading' 
+                               AND updated_at < datetime('now', ?)
+                             RETURNING id"""
+RESET_STUCK_PROCESSING_SQL = """UPDATE photos 
+                                SET status = 'pending'
+                                WHERE status = 'processing' 
+                                  AND created_at < datetime('now', ?)
+                                RETURNING id"""
+RESET_PHOTO_PENDING_SQL = "UPDATE photos SET status = 'pending' WHERE id = ?"
+GET_STATS_SQL = """SELECT 'status', status, COUNT(*) FROM photos GROUP BY status
+                   UNION ALL
+                   SELECT 'counter', name, value FROM stats_counters"""
+# Person total alongside every enrollment, read as one statement so both come
+# from the same snapshot. The one-row left side keeps the total when there
+# are no enrollments yet (the enrollment columns are then NULL).
+GET_ENROLLMENT_OVERVIEW_SQL = """SELECT (SELECT value FROM stats_counters WHERE name = 'persons') AS total_persons, e.*
+                                 FROM (SELECT 1) LEFT JOIN enrollments e ON 1
+                                 ORDER BY e.created_at DESC, e.id DESC"""
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Idle read-only connections kept for polled, read-only queries such as get_stats()
+READ_POOL_SIZE = 4
+
+# Persons remembered per thread by get_person_by_id()
+PERSON_CACHE_SIZE = 256
+
 
 class Database:
     """SQLite database manager for the photo pipeline.
@@ -201,94 +386,349 @@ class Database:
     
     def __init__(self, db_path: Optional[Path] = None):
         self.db_path = db_path or get_config().db_path
+        # Resolve the path and create its directory once, not per thread connection
+        self._db_path_str = str(self.db_path)
+        # WAL and mmap only apply to file-backed databases
+        self._in_memory = self._db_path_str == ":memory:" or self._db_path_str.startswith("file::memory:")
+        if not self._in_memory:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._local = threading.local()
+        # Serializes writes from all threads of this process. Waiting on an
+        # in-process lock is much cheaper than SQLite busy-waiting, and writers
+        # never hit 'database is locked' against each other.
+        self._write_lock = threading.RLock()
+        self._read_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=READ_POOL_SIZE)
     
     def connect(self) -> sqlite3.Connection:
         """Get or create thread-local database connection."""
         if not hasattr(self._local, 'connection') or self._local.connection is None:
-            self.db_path.parent.mkdir(parents=True, exist_ok=True)
             self._local.connection = sqlite3.connect(
-                str(self.db_path),
+                self._db_path_str,
                 check_same_thread=False,
                 timeout=60.0,
-                isolation_level=None  # Autocommit mode to prevent dangling read transactions
+                isolation_level=None,  # Autocommit mode to prevent dangling read transactions
+                cached_statements=STATEMENT_CACHE_SIZE,
+                detect_types=sqlite3.PARSE_COLNAMES
             )
             self._local.connection.row_factory = sqlite3.Row
             
-            # Configure SQLite for better concurrency
+            # Configure SQLite for better concurrency. Lock waits are handled
+            # entirely by SQLite's busy handler; a 'database is locked' error
+            # means it already waited the full minute.
             self._local.connection.execute("PRAGMA busy_timeout = 60000")
-            self._local.connection.execute("PRAGMA journal_mode = WAL")
             self._local.connection.execute("PRAGMA foreign_keys = ON")
-            self._local.connection.execute("PRAGMA synchronous = NORMAL")
+            # 64 MiB page cache (negative value = KiB) keeps hot pages out of the OS read path
+            self._local.connection.execute("PRAGMA cache_size = -65536")
+            self._local.connection.execute("PRAGMA temp_store = MEMORY")
+            if not self._in_memory:
+                self._local.connection.execute("PRAGMA journal_mode = WAL")
+                self._local.connection.execute("PRAGMA synchronous = NORMAL")
+                # Memory-map up to 256 MiB of the file so page reads skip the read() copy
+                self._local.connection.execute("PRAGMA mmap_size = 268435456")
+                # Checkpoint every ~1000 WAL pages to keep the WAL file bounded
+                self._local.connection.execute("PRAGMA wal_autocheckpoint = 1000")
             
         return self._local.connection
     
     def close(self) -> None:
-        """Close the thread-local database connection."""
+        """Close the thread-local database connection and any pooled read connections."""
         if hasattr(self._local, 'connection') and self._local.connection:
+            # SQLite recommends a final optimize before closing a connection
+            try:
+                self.optimize()
+            except sqlite3.Error as e:
+                logger.debug(f"PRAGMA optimize on close failed: {e}")
             self._local.connection.close()
             self._local.connection = None
+            self._invalidate_caches()
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
     
-    def initialize(self) -> None:
-        """Create tables if they don't exist."""
-        conn = self.connect()
-        conn.executescript(SCHEMA_SQL)
-        # Commit not strictly needed for DDL in autocommit but good practice
+    def _open_read_connection(self) -> sqlite3.Connection:
+        """Open a read-only connection for the read pool."""
+        uri = Path(self._db_path_str).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            check_same_thread=False,
+            timeout=60.0,
+            isolation_level=None,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            detect_types=sqlite3.PARSE_COLNAMES
+        )
+        conn.row_factory = sqlite3.Row
+        # Same read-side tuning as connect(); the default 2 MiB cache would
+        # otherwise make every stats poll re-read its index pages
+        conn.execute("PRAGMA busy_timeout = 60000")
+        conn.execute("PRAGMA cache_size = -65536")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+    
+    @contextmanager
+    def _read_conn(self):
+        """Borrow a read-only connection from the pool.
+        
+        Polling threads (GUI timers, web handlers) share a few pooled
+        connections instead of each opening a thread-local read/write one.
+        In WAL mode they read concurrently with the writer. They don't see
+        the calling thread's uncommitted writes, so don't use this inside
+        transaction().
+        """
+        if self._in_memory:
+            # A second connection to ':memory:' would be a different database
+            yield self.connect()
+            return
         try:
-            conn.commit() 
-        except Exception:
-            pass
-            
-        # Reset any photos stuck in processing from a previous crash
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = self._open_read_connection()
         try:
-            self._reset_stuck_processing()
-        except Exception as e:
-            logger.warning(f"Could not reset stuck processing photos: {e}")
+            yield conn
+        finally:
+            try:
+                self._read_pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
     
-    @retry_on_lock()
-    def _reset_stuck_processing(self) -> int:
-        """Reset photos stuck in 'processing' status back to 'pending'.
+    def optimize(self) -> None:
+        """Refresh query planner statistics where SQLite thinks they're stale.
         
-        Also cleans up orphaned face records that were committed before
-        the crash, and recalculates affected person centroids to prevent
-        duplicates and inflated face counts on reprocessing.
+        PRAGMA optimize only runs ANALYZE on tables whose contents changed
+        enough to matter, and analysis_limit caps how many rows each index
+        scan reads, so this is cheap enough to run periodically.
         """
         conn = self.connect()
+        with self._write_lock:
+            conn.execute("PRAGMA analysis_limit = 400")
+            conn.execute("PRAGMA optimize")
+    
+    @contextmanager
+    def transaction(self):
+        """Run a block of statements as one BEGIN IMMEDIATE transaction.
+        
+        Takes the in-process write lock and SQLite's write lock up front, then
+        commits on success or rolls back on error. If the connection is already
+        inside a transaction, the block simply joins it, so helpers can nest.
+        
+        Use it around logical units of work so a crash can't leave them half
+        applied, and so N writes cost one commit:
         
-        # Step 1: Find photos stuck in processing
+            with db.transaction():
+                person_ids = [assign_person(emb, threshold) for _, emb, _ in faces]
+                db.create_faces_bulk(photo_id, faces, person_ids)
+        
+        Single-statement write methods only take the write lock and never
+        commit on their own, so they join an enclosing transaction.
+        """
+        conn = self.connect()
+        with self._write_lock:
+            if conn.in_transaction:
+                yield conn
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                # Persons read inside the block may have been cached uncommitted
+                self._invalidate_caches()
+                raise
+            conn.execute("COMMIT")
+    
+    def initialize(self) -> None:
+        """Create tables if they don't exist."""
+        conn = self.connect()
+        # Older databases may hold duplicate enrollments, which would make the
+        # unique index in SCHEMA_SQL fail to build
+        self._dedupe_enrollments()
+        
+        # Startup repairs, each run after the schema exists. A failing step is
+        # rolled back to its savepoint and logged; the others still apply.
+        repairs = (
+            # Fold the four bbox_* columns of older databases into one packed column
+            (self._migrate_bbox_columns, "migrate legacy bbox columns"),
+            # Seed the row counters from the real tables
+            (self._backfill_stats_counters, "backfill stats counters"),
+            # Convert embeddings written by older versions (pickle) to raw float32
+            (self._migrate_pickled_embeddings, "migrate legacy pickled embeddings"),
+            # Reset any photos stuck in processing from a previous crash
+            (self._reset_stuck_processing, "reset stuck processing photos"),
+        )
+        
+        # The DDL and all repairs share one write transaction: one lock
+        # acquisition and one commit at cold start, and a failure can't leave
+        # a half-created schema behind. (executescript() would commit an open
+        # transaction, so it has to be the one issuing BEGIN.)
+        with self._write_lock:
+            try:
+                conn.executescript(f"BEGIN IMMEDIATE;\n{SCHEMA_SQL}")
+                for repair, description in repairs:
+                    conn.execute("SAVEPOINT startup_repair")
+                    try:
+                        repair()
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO startup_repair")
+                        logger.warning(f"Could not {description}: {e}")
+                    conn.execute("RELEASE startup_repair")
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+    
+    def _backfill_stats_counters(self) -> None:
+        """Recount faces, persons and enrollments into stats_counters.
+        
+        Runs once at startup; the triggers keep the counters current after that.
+        Recounting every start also heals any drift, e.g. from a database that
+        was edited by an older version without the triggers.
+        """
+        with self.transaction() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO stats_counters (name, value) VALUES
+                   ('faces', (SELECT COUNT(*) FROM faces)),
+                   ('persons', (SELECT COUNT(*) FROM persons)),
+                   ('enrollments', (SELECT COUNT(*) FROM enrollments))"""
+            )
+    
+    def _dedupe_enrollments(self) -> int:
+        """Delete duplicate enrollments for the same person, keeping the first one.
+        
+        Returns:
+            Number of rows removed.
+        """
+        conn = self.connect()
+        # Nothing to do on a fresh database, or once the unique index exists
         cursor = conn.execute(
-            "SELECT id FROM photos WHERE status = 'processing'"
+            """SELECT name FROM sqlite_master
+               WHERE name IN ('enrollments', 'uniq_enrollments_person')"""
         )
-        stuck_photo_ids = [row[0] for row in cursor.fetchall()]
+        if {row[0] for row in cursor} != {"enrollments"}:
+            return 0
         
-        if not stuck_photo_ids:
-            # Also clean up any 'pending' photos that have orphaned face records
+        with self._write_lock:
             cursor = conn.execute(
-                "SELECT DISTINCT p.id FROM photos p INNER JOIN faces f ON f.photo_id = p.id WHERE p.status = 'pending'"
+                """DELETE FROM enrollments
+                   WHERE person_id IS NOT NULL
+                     AND id NOT IN (SELECT MIN(id) FROM enrollments
+                                    WHERE person_id IS NOT NULL
+                                    GROUP BY person_id)"""
             )
-            orphan_photo_ids = [row[0] for row in cursor.fetchall()]
-            if orphan_photo_ids:
-                logger.warning(f"Found {len(orphan_photo_ids)} pending photo(s) with orphaned face records, cleaning up...")
-                self._cleanup_orphaned_faces(orphan_photo_ids)
-            return 0
+        if cursor.rowcount:
+            logger.warning(f"Removed {cursor.rowcount} duplicate enrollment(s)")
+        return cursor.rowcount
+    
+    def _migrate_bbox_columns(self) -> bool:
+        """Replace the legacy bbox_x/y/w/h face columns with one packed bbox column.
         
-        logger.warning(f"Found {len(stuck_photo_ids)} photo(s) stuck in 'processing' status")
+        Uses ALTER TABLE ... DROP COLUMN (SQLite 3.35+), which rewrites the table
+        so the old columns' storage is actually reclaimed. No-op once migrated.
         
-        # Step 2: Clean up orphaned face records from the crashed processing
-        self._cleanup_orphaned_faces(stuck_photo_ids)
+        Returns:
+            True if the table was migrated.
+        """
+        conn = self.connect()
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(faces)")}
+        if "bbox_x" not in columns:
+            return False
         
-        # Step 3: Reset photo status to pending
-        with conn:
-            placeholders = ','.join('?' * len(stuck_photo_ids))
+        with self.transaction() as conn:
+            if "bbox" not in columns:
+                conn.execute("ALTER TABLE faces ADD COLUMN bbox INTEGER NOT NULL DEFAULT 0")
+            # Same layout as _pack_bbox(); SQLite's INTEGER is signed 64-bit too
             conn.execute(
-                f"UPDATE photos SET status = 'pending' WHERE id IN ({placeholders})",
-                stuck_photo_ids
+                """UPDATE faces SET bbox = (bbox_x << 48)
+                                          | ((bbox_y & 65535) << 32)
+                                          | ((bbox_w & 65535) << 16)
+                                          | (bbox_h & 65535)"""
+            )
+            for column in ("bbox_x", "bbox_y", "bbox_w", "bbox_h"):
+                conn.execute(f"ALTER TABLE faces DROP COLUMN {column}")
+        
+        logger.info("Migrated face bounding boxes to packed storage")
+        return True
+    
+    def _migrate_pickled_embeddings(self) -> int:
+        """Rewrite legacy pickled embedding/centroid BLOBs as raw float32 bytes.
+        
+        Older databases stored vectors with pickle.dumps(). Rows are detected by
+        the pickle protocol header and converted in place, so this is a no-op
+        once a database has been migrated.
+        
+        Returns:
+            Number of rows rewritten.
+        """
+        conn = self.connect()
+        migrated = 0
+        
+        for table, column in (("faces", "embedding"), ("persons", "centroid")):
+            cursor = conn.execute(
+                f"SELECT id, {column} FROM {table} WHERE substr({column}, 1, 1) = X'80'"
+            )
+            updates = []
+            for row_id, blob in cursor.fetchall():
+                if not _is_legacy_pickle(blob):
+                    continue
+                try:
+                    vector = pickle.loads(blob)
+                except Exception:
+                    continue
+                updates.append((_emb_to_blob(vector), row_id))
+            
+            if updates:
+                with self._write_lock:
+                    conn.executemany(
+                        f"UPDATE {table} SET {column} = ? WHERE id = ?",
+                        updates
+                    )
+                migrated += len(updates)
+        
+        if migrated:
+            logger.info(f"Migrated {migrated} pickled embedding(s) to raw float32 storage")
+        return migrated
+    
+    def _reset_stuck_processing(self) -> int:
+        """Reset photos stuck in 'processing' status back to 'pending'.
+        
+        Also cleans up orphaned face records that were committed before
+        the crash, and recalculates affected person centroids to prevent
+        duplicates and inflated face counts on reprocessing. The whole
+        recovery runs as one transaction, so a second crash mid-recovery
+        can't leave faces deleted but photos still marked 'processing'.
+        """
+        with self.transaction() as conn:
+            # Step 1: Find photos stuck in processing
+            cursor = conn.execute(
+                "SELECT id FROM photos WHERE status = 'processing'"
             )
+            stuck_photo_ids = [row[0] for row in cursor.fetchall()]
+            
+            if not stuck_photo_ids:
+                # Also clean up any 'pending' photos that have orphaned face records
+                cursor = conn.execute(
+                    "SELECT DISTINCT p.id FROM photos p INNER JOIN faces f ON f.photo_id = p.id WHERE p.status = 'pending'"
+                )
+                orphan_photo_ids = [row[0] for row in cursor.fetchall()]
+                if orphan_photo_ids:
+                    logger.warning(f"Found {len(orphan_photo_ids)} pending photo(s) with orphaned face records, cleaning up...")
+                    self._cleanup_orphaned_faces(orphan_photo_ids)
+                return 0
+            
+            logger.warning(f"Found {len(stuck_photo_ids)} photo(s) stuck in 'processing' status")
+            
+            # Step 2: Clean up orphaned face records from the crashed processing
+            self._cleanup_orphaned_faces(stuck_photo_ids)
+            
+            # Step 3: Reset photo status to pending
+            self.reset_specific_stuck(stuck_photo_ids)
         
         logger.warning(f"Reset {len(stuck_photo_ids)} photo(s) stuck in 'processing' status back to 'pending'")
         return len(stuck_photo_ids)
     
-    @retry_on_lock()
     def _cleanup_orphaned_faces(self, photo_ids: list) -> None:
         """Delete orphaned face records for given photos and recalculate affected person centroids.
         
@@ -296,72 +736,91 @@ class Database:
         never reaches 'completed'. This method undoes that partial work so the
         photo can be cleanly reprocessed without duplicates.
         """
-        conn = self.connect()
-        
         placeholders = ','.join('?' * len(photo_ids))
         
-        # Find which persons were affected
-        cursor = conn.execute(
-            f"SELECT DISTINCT person_id FROM faces WHERE photo_id IN ({placeholders}) AND person_id IS NOT NULL",
-            photo_ids
-        )
-        affected_person_ids = [row[0] for row in cursor.fetchall()]
-        
-        # Count faces being removed
-        cursor = conn.execute(
-            f"SELECT COUNT(*) FROM faces WHERE photo_id IN ({placeholders})",
-            photo_ids
-        )
-        face_count = cursor.fetchone()[0]
-        
-        if face_count == 0:
-            return
-        
-        # Delete the orphaned face records
-        with conn:
-            conn.execute(
+        with self.transaction() as conn:
+            # Find which persons were affected
+            cursor = conn.execute(
+                f"SELECT DISTINCT person_id FROM faces WHERE photo_id IN ({placeholders}) AND person_id IS NOT NULL",
+                photo_ids
+            )
+            affected_person_ids = [row[0] for row in cursor.fetchall()]
+            
+            # Delete the orphaned face records
+            cursor = conn.execute(
                 f"DELETE FROM faces WHERE photo_id IN ({placeholders})",
                 photo_ids
             )
-        
-        logger.warning(f"Deleted {face_count} orphaned face record(s) from photo(s) {photo_ids}")
-        
-        # Recalculate face_count for affected persons
-        for person_id in affected_person_ids:
+            face_count = cursor.rowcount
+            
+            if face_count == 0:
+                return
+            
+            logger.warning(f"Deleted {face_count} orphaned face record(s) from photo(s) {photo_ids}")
+            
+            if not affected_person_ids:
+                return
+            
+            # Count remaining faces for all affected persons in one query
+            person_placeholders = ','.join('?' * len(affected_person_ids))
             cursor = conn.execute(
-                "SELECT COUNT(*) FROM faces WHERE person_id = ?",
-                (person_id,)
+                f"""SELECT person_id, COUNT(*) FROM faces
+                    WHERE person_id IN ({person_placeholders})
+                    GROUP BY person_id""",
+                affected_person_ids
             )
-            actual_count = cursor.fetchone()[0]
+            remaining_counts = dict(cursor)
             
-            if actual_count == 0:
-                # Person has no faces left — delete it
-                with conn:
-                    conn.execute("DELETE FROM persons WHERE id = ?", (person_id,))
-                logger.warning(f"Removed empty person cluster ID {person_id} (had no remaining faces)")
-            else:
-                # Recalculate centroid from remaining faces
-                cursor = conn.execute(
-                    "SELECT embedding FROM faces WHERE person_id = ?",
-                    (person_id,)
+            # Persons missing from the grouped result have no faces left — delete them
+            empty_person_ids = [pid for pid in affected_person_ids if pid not in remaining_counts]
+            if empty_person_ids:
+                self._invalidate_caches()
+                empty_placeholders = ','.join('?' * len(empty_person_ids))
+                conn.execute(
+                    f"DELETE FROM persons WHERE id IN ({empty_placeholders})",
+                    empty_person_ids
                 )
-                embeddings = [pickle.loads(row[0]) for row in cursor.fetchall()]
-                
-                if embeddings:
-                    new_centroid = np.mean(embeddings, axis=0)
-                    norm = np.linalg.norm(new_centroid)
-                    if norm > 0:
-                        new_centroid = new_centroid / norm
-                    
-                    centroid_blob = pickle.dumps(new_centroid)
-                    with conn:
-                        conn.execute(
-                            "UPDATE persons SET centroid = ?, face_count = ? WHERE id = ?",
-                            (centroid_blob, actual_count, person_id)
-                        )
-                    logger.info(f"Recalculated centroid for person {person_id} (face_count: {actual_count})")
-    
-    @retry_on_lock()
+                logger.warning(f"Removed empty person cluster(s) {empty_person_ids} (had no remaining faces)")
+            
+            surviving_person_ids = list(remaining_counts)
+            if surviving_person_ids:
+                self._recalculate_centroids(surviving_person_ids)
+    
+    def _recalculate_centroids(self, person_ids: list) -> None:
+        """Recompute centroids and face counts for several persons in one pass.
+        
+        Loads every remaining embedding for the given persons with a single
+        query, then computes all per-person means with one vectorized reduction.
+        """
+        with self.transaction() as conn:
+            placeholders = ','.join('?' * len(person_ids))
+            cursor = conn.execute(
+                f"SELECT person_id, embedding FROM faces WHERE person_id IN ({placeholders}) ORDER BY person_id",
+                person_ids
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            
+            pids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            embeddings = np.stack([_blob_to_emb(row[1]) for row in rows])
+            
+            # Rows are sorted by person_id, so each person is one contiguous slice
+            unique_pids, starts, counts = np.unique(pids, return_index=True, return_counts=True)
+            centroids = np.add.reduceat(embeddings, starts, axis=0) / counts[:, None]
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            np.divide(centroids, norms, out=centroids, where=norms > 0)
+            
+            self._invalidate_caches()
+            conn.executemany(
+                UPDATE_PERSON_CENTROID_SQL,
+                [
+                    (_emb_to_blob(centroid), int(count), int(pid))
+                    for pid, centroid, count in zip(unique_pids, centroids, counts)
+                ]
+            )
+        logger.info(f"Recalculated centroids for {len(unique_pids)} person(s): {unique_pids.tolist()}")
+    
     def get_faces_count_for_photo(self, photo_id: int) -> int:
         """Check how many face records exist for a photo."""
         conn = self.connect()
@@ -370,38 +829,54 @@ class Database:
             (photo_id,)
         )
         count = cursor.fetchone()[0]
-        conn.commit()
         return count
     
     # =========================================================================
     # Photo Operations
     # =========================================================================
     
-    @retry_on_lock()
     def photo_exists(self, file_hash: str) -> bool:
         """Check if a photo with this hash already exists."""
         conn = self.connect()
-        cursor = conn.execute(
-            "SELECT 1 FROM photos WHERE file_hash = ?",
-            (file_hash,)
-        )
-        result = cursor.fetchone() is not None
-        conn.commit() # Close implicit read transaction
-        return result
+        cursor = conn.execute(PHOTO_EXISTS_SQL, (file_hash,))
+        return cursor.fetchone() is not None
     
-    @retry_on_lock()
     def create_photo(self, file_hash: str, original_path: str) -> int:
         """Create a new photo record, returns photo ID."""
         conn = self.connect()
-        with conn:
+        with self._write_lock:
             cursor = conn.execute(
-                """INSERT INTO photos (file_hash, original_path, status, created_at)
-                   VALUES (?, ?, 'pending', ?)""",
-                (file_hash, original_path, datetime.now())
+                """INSERT INTO photos (file_hash, original_path, status)
+                   VALUES (?, ?, 'pending')""",
+                (file_hash, original_path)
             )
             return cursor.lastrowid
     
-    @retry_on_lock()
+    def upsert_photo(self, file_hash: str, original_path: str) -> Tuple[int, bool]:
+        """Create a photo record unless one with this hash already exists.
+        
+        Replaces the photo_exists() + create_photo() pair with one atomic
+        statement, so two threads seeing the same file can't race into a
+        UNIQUE constraint error.
+        
+        Returns:
+            (photo_id, created) — created is False if the hash was already known.
+        """
+        conn = self.connect()
+        with self._write_lock:
+            row = conn.execute(
+                """INSERT INTO photos (file_hash, original_path, status)
+                   VALUES (?, ?, 'pending')
+                   ON CONFLICT(file_hash) DO NOTHING
+                   RETURNING id""",
+                (file_hash, original_path)
+            ).fetchone()
+        if row is not None:
+            return row[0], True
+        
+        cursor = conn.execute("SELECT id FROM photos WHERE file_hash = ?", (file_hash,))
+        return cursor.fetchone()[0], False
+    
     def update_photo_processing(
         self,
         photo_id: int,
@@ -412,52 +887,64 @@ class Database:
     ) -> None:
         """Update photo after processing."""
         conn = self.connect()
-        with conn:
+        with self._write_lock:
             conn.execute(
                 """UPDATE photos 
                    SET processed_path = ?, thumbnail_path = ?, face_count = ?,
-                       status = ?, processed_at = ?
+                       status = ?, processed_at = CURRENT_TIMESTAMP
                    WHERE id = ?""",
-                (processed_path, thumbnail_path, face_count, status, datetime.now(), photo_id)
+                (processed_path, thumbnail_path, face_count, status, photo_id)
             )
     
-    @retry_on_lock()
     def update_photo_status(self, photo_id: int, status: str) -> None:
         """Update photo status."""
         conn = self.connect()
-        with conn:
+        with self._write_lock:
             conn.execute(
                 "UPDATE photos SET status = ? WHERE id = ?",
                 (status, photo_id)
             )
     
-    @retry_on_lock()
     def get_pending_photos(self) -> List[Photo]:
         """Get all photos with pending status."""
+        return list(self.iter_pending_photos())
+    
+    def iter_pending_photos(self, batch_size: int = 256) -> Iterator[Photo]:
+        """Yield pending photos in insertion order, one batch at a time.
+        
+        Uses keyset pagination on id, so memory use is bounded by batch_size
+        no matter how large the pending backlog is.
+        """
+        last_id = 0
+        while True:
+            rows = self._fetch_pending_batch(last_id, batch_size)
+            for row in rows:
+                yield self._row_to_photo(row)
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]["id"]
+    
+    def _fetch_pending_batch(self, after_id: int, limit: int) -> List[sqlite3.Row]:
+        """Fetch the next batch of pending photo rows with id > after_id."""
         conn = self.connect()
         cursor = conn.execute(
-            "SELECT * FROM photos WHERE status = 'pending' ORDER BY created_at"
+            GET_PENDING_BATCH_SQL,
+            (after_id, limit)
         )
-        rows = cursor.fetchall()
-        conn.commit()
-        return [self._row_to_photo(row) for row in rows]
+        return cursor.fetchall()
     
-    @retry_on_lock()
     def get_photo_by_id(self, photo_id: int) -> Optional[Photo]:
         """Get a photo by ID."""
         conn = self.connect()
-        cursor = conn.execute("SELECT * FROM photos WHERE id = ?", (photo_id,))
+        cursor = conn.execute(GET_PHOTO_BY_ID_SQL, (photo_id,))
         row = cursor.fetchone()
-        conn.commit()
         return self._row_to_photo(row) if row else None
     
-    @retry_on_lock()
     def get_photo_by_hash(self, file_hash: str) -> Optional[Photo]:
         """Get a photo by file hash."""
         conn = self.connect()
-        cursor = conn.execute("SELECT * FROM photos WHERE file_hash = ?", (file_hash,))
+        cursor = conn.execute(GET_PHOTO_BY_HASH_SQL, (file_hash,))
         row = cursor.fetchone()
-        conn.commit()
         return self._row_to_photo(row) if row else None
     
     def _row_to_photo(self, row: sqlite3.Row) -> Photo:
@@ -478,7 +965,6 @@ class Database:
     # Face Operations
     # =========================================================================
     
-    @retry_on_lock()
     def create_face(
         self,
         photo_id: int,
@@ -489,38 +975,81 @@ class Database:
     ) -> int:
         """Create a new face record."""
         conn = self.connect()
-        embedding_blob = pickle.dumps(embedding)
-        with conn:
+        embedding_blob = _emb_to_blob(embedding)
+        with self._write_lock:
             cursor = conn.execute(
-                """INSERT INTO faces (photo_id, person_id, bbox_x, bbox_y, bbox_w, bbox_h, embedding, confidence)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (photo_id, person_id, bbox[0], bbox[1], bbox[2], bbox[3], embedding_blob, confidence)
+                INSERT_FACE_SQL,
+                (photo_id, person_id, _pack_bbox(bbox), embedding_blob, confidence)
             )
             return cursor.lastrowid
     
-    @retry_on_lock()
+    def create_faces_bulk(
+        self,
+        photo_id: int,
+        faces: List[Tuple[Tuple[int, int, int, int], np.ndarray, float]],
+        person_ids: Optional[List[Optional[int]]] = None
+    ) -> List[int]:
+        """Create several face records for one photo in a single transaction.
+        
+        Args:
+            photo_id: Photo the faces belong to
+            faces: List of (bbox, embedding, confidence) tuples
+            person_ids: Optional person assignment per face (same order as faces)
+        
+        Returns:
+            List of new face IDs, in the same order as faces.
+        """
+        if not faces:
+            return []
+        if person_ids is None:
+            person_ids = [None] * len(faces)
+        
+        # Convert all embeddings to float32 in one copy, then serialize per row
+        embeddings = np.ascontiguousarray(np.stack([f[1] for f in faces]), dtype=np.float32)
+        rows = [
+            (photo_id, person_id, _pack_bbox(bbox), _emb_to_blob(embedding), confidence)
+            for (bbox, _, confidence), embedding, person_id in zip(faces, embeddings, person_ids)
+        ]
+        
+        # Autocommit connection: open an explicit transaction so N inserts cost one commit
+        with self.transaction() as conn:
+            conn.executemany(INSERT_FACE_SQL, rows)
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        
+        # The transaction holds the SQLite write lock throughout, so IDs are contiguous
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+    
     def update_face_person(self, face_id: int, person_id: int) -> None:
         """Assign a face to a person."""
         conn = self.connect()
-        with conn:
+        with self._write_lock:
             conn.execute(
-                "UPDATE faces SET person_id = ? WHERE id = ?",
+                UPDATE_FACE_PERSON_SQL,
                 (person_id, face_id)
             )
     
-    @retry_on_lock()
     def get_faces_by_photo(self, photo_id: int) -> List[Face]:
-        """Get all faces for a photo."""
+        """Get all faces for a photo, including embeddings."""
         conn = self.connect()
         cursor = conn.execute(
-            "SELECT * FROM faces WHERE photo_id = ?",
+            GET_FACES_BY_PHOTO_SQL,
             (photo_id,)
         )
         rows = cursor.fetchall()
-        conn.commit()
         return [self._row_to_face(row) for row in rows]
     
-    @retry_on_lock()
+    def get_faces_by_photo_meta(self, photo_id: int) -> List[FaceSummary]:
+        """Get all faces for a photo without loading their embeddings."""
+        conn = self.connect()
+        cursor = conn.execute(
+            GET_FACES_BY_PHOTO_META_SQL,
+            (photo_id,)
+        )
+        return [
+            FaceSummary(face_id, pid, person_id, *_unpack_bbox(bbox), confidence)
+            for face_id, pid, person_id, bbox, confidence in cursor.fetchall()
+        ]
+    
     def get_unique_persons_in_photo(self, photo_id: int) -> List[int]:
         """Get list of unique person IDs in a photo."""
         conn = self.connect()
@@ -529,20 +1058,20 @@ class Database:
             (photo_id,)
         )
         rows = cursor.fetchall()
-        conn.commit()
         return [row[0] for row in rows]
     
     def _row_to_face(self, row: sqlite3.Row) -> Face:
         """Convert database row to Face object."""
+        bbox_x, bbox_y, bbox_w, bbox_h = _unpack_bbox(row["bbox"])
         return Face(
             id=row["id"],
             photo_id=row["photo_id"],
             person_id=row["person_id"],
-            bbox_x=row["bbox_x"],
-            bbox_y=row["bbox_y"],
-            bbox_w=row["bbox_w"],
-            bbox_h=row["bbox_h"],
-            embedding=pickle.loads(row["embedding"]),
+            bbox_x=bbox_x,
+            bbox_y=bbox_y,
+            bbox_w=bbox_w,
+            bbox_h=bbox_h,
+            embedding=row["embedding"],
             confidence=row["confidence"],
         )
     
@@ -550,68 +1079,188 @@ class Database:
     # Person Operations
     # =========================================================================
     
-    @retry_on_lock()
-    def create_person(self, name: str, centroid: np.ndarray) -> int:
-        """Create a new person cluster."""
+    def create_person(self, name: Optional[str], centroid: np.ndarray) -> int:
+        """Create a new person cluster.
+        
+        If name is None, the person is named Person_XXX after its own ID.
+        The name is set in the same transaction as the insert, so concurrent
+        workers can never pick the same number.
+        """
         conn = self.connect()
-        centroid_blob = pickle.dumps(centroid)
-        with conn:
+        centroid_blob = _emb_to_blob(centroid)
+        if name is not None:
+            with self._write_lock:
+                cursor = conn.execute(
+                    """INSERT INTO persons (name, centroid, face_count)
+                       VALUES (?, ?, 1)""",
+                    (name, centroid_blob)
+                )
+                self._cache_centroid(cursor.lastrowid, centroid)
+                return cursor.lastrowid
+        
+        with self.transaction():
             cursor = conn.execute(
-                """INSERT INTO persons (name, centroid, face_count, created_at)
-                   VALUES (?, ?, 1, ?)""",
-                (name, centroid_blob, datetime.now())
+                """INSERT INTO persons (name, centroid, face_count)
+                   VALUES ('', ?, 1)""",
+                (centroid_blob,)
             )
-            return cursor.lastrowid
+            person_id = cursor.lastrowid
+            conn.execute(
+                "UPDATE persons SET name = printf('Person_%03d', id) WHERE id = ?",
+                (person_id,)
+            )
+            self._cache_centroid(person_id, centroid)
+        return person_id
     
-    @retry_on_lock()
     def update_person_centroid(self, person_id: int, centroid: np.ndarray, face_count: int) -> None:
         """Update person centroid and face count."""
         conn = self.connect()
-        centroid_blob = pickle.dumps(centroid)
-        with conn:
+        centroid_blob = _emb_to_blob(centroid)
+        with self._write_lock:
             conn.execute(
-                "UPDATE persons SET centroid = ?, face_count = ? WHERE id = ?",
+                UPDATE_PERSON_CENTROID_SQL,
                 (centroid_blob, face_count, person_id)
             )
+            self._cache_centroid(person_id, centroid)
+    
+    def delete_person(self, person_id: int) -> None:
+        """Delete a person cluster (its faces should be reassigned first)."""
+        conn = self.connect()
+        with self._write_lock:
+            conn.execute("DELETE FROM persons WHERE id = ?", (person_id,))
+            self._invalidate_caches()
     
-    @retry_on_lock()
     def get_all_persons(self) -> List[Person]:
         """Get all person clusters."""
         conn = self.connect()
-        cursor = conn.execute("SELECT * FROM persons ORDER BY id")
+        cursor = conn.execute(GET_ALL_PERSONS_SQL)
         rows = cursor.fetchall()
-        conn.commit()
         return [self._row_to_person(row) for row in rows]
     
-    @retry_on_lock()
+    def get_all_centroids(self) -> Tuple[np.ndarray, List[int]]:
+        """Get all person centroids as one (N, dim) matrix plus the parallel person IDs.
+        
+        For nearest-cluster search. Rows are L2-normalized, so cosine
+        similarity against a unit query is a plain dot product. The matrix is
+        read once and then kept per thread: this thread's create_person() and
+        update_person_centroid() patch it in place, so matching each new face
+        doesn't re-read and decode every centroid. The returned matrix is
+        read-only.
+        """
+        self._sync_caches()
+        cached = self._local.centroid_cache
+        if cached is None:
+            conn = self.connect()
+            rows = conn.execute(GET_ALL_CENTROIDS_SQL).fetchall()
+            if not rows:
+                return np.empty((0, 0), dtype=np.float32), []
+            
+            ids = [row[0] for row in rows]
+            blobs = [row[1] for row in rows]
+            if any(blob[:4] == _BLOSC_MAGIC for blob in blobs):
+                centroids = np.stack([_blob_to_emb(blob) for blob in blobs])
+            else:
+                # Uncompressed blobs decode with a single np.frombuffer
+                centroids = np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(len(blobs), -1).copy()
+            _normalize_rows(centroids)
+            cached = (centroids, ids, {person_id: row for row, person_id in enumerate(ids)})
+            self._local.centroid_cache = cached
+        
+        centroids, ids, _ = cached
+        view = centroids.view()
+        view.flags.writeable = False
+        return view, list(ids)
+    
+    def get_all_persons_meta(self) -> List[PersonSummary]:
+        """Get all person clusters without decoding their centroids."""
+        with self._read_conn() as conn:
+            cursor = conn.execute(GET_ALL_PERSONS_META_SQL)
+            return [PersonSummary(*row) for row in cursor.fetchall()]
+    
     def get_person_by_id(self, person_id: int) -> Optional[Person]:
-        """Get a person by ID."""
+        """Get a person by ID.
+        
+        Routing looks up the same few persons for every photo, so recent
+        results are kept in a small LRU cache until the persons table changes.
+        """
+        self._sync_caches()
+        cache = self._local.person_cache
+        person = cache.get(person_id)
+        if person is not None:
+            cache.move_to_end(person_id)
+            return person
+        
         conn = self.connect()
-        cursor = conn.execute("SELECT * FROM persons WHERE id = ?", (person_id,))
+        cursor = conn.execute(GET_PERSON_BY_ID_SQL, (person_id,))
         row = cursor.fetchone()
-        conn.commit()
-        return self._row_to_person(row) if row else None
+        if row is None:
+            return None
+        person = self._row_to_person(row)
+        cache[person_id] = person
+        if len(cache) > PERSON_CACHE_SIZE:
+            cache.popitem(last=False)
+        return person
+    
+    def _sync_caches(self) -> None:
+        """Drop this thread's person caches if another connection has committed.
+        
+        The caches are get_person_by_id()'s LRU and get_all_centroids()'s
+        matrix. PRAGMA data_version changes whenever another connection
+        (another thread, the GUI or the web server) commits. Writes on this
+        thread's own connection update or invalidate the caches directly.
+        """
+        version = self.connect().execute("PRAGMA data_version").fetchone()[0]
+        if getattr(self._local, "cache_version", None) != version:
+            self._local.person_cache = OrderedDict()
+            self._local.centroid_cache = None
+            self._local.cache_version = version
+    
+    def _invalidate_caches(self) -> None:
+        """Forget everything cached by this thread after it changed the persons table."""
+        self._local.cache_version = None
+    
+    def _cache_centroid(self, person_id: int, centroid: np.ndarray) -> None:
+        """Apply a centroid this thread just wrote to its cached matrix."""
+        person_cache = getattr(self._local, "person_cache", None)
+        if person_cache is not None:
+            person_cache.pop(person_id, None)
+        cached = getattr(self._local, "centroid_cache", None)
+        if cached is None:
+            return
+        centroids, ids, rows = cached
+        centroid = _normalize_rows(np.array(centroid, dtype=np.float32, ndmin=2))[0]
+        if centroid.shape != centroids.shape[1:]:
+            self._invalidate_caches()
+        elif person_id in rows:
+            centroids[rows[person_id]] = centroid
+        else:
+            rows[person_id] = len(ids)
+            ids.append(person_id)
+            self._local.centroid_cache = (np.vstack([centroids, centroid]), ids, rows)
     
-    @retry_on_lock()
     def get_next_person_number(self) -> int:
-        """Get the next available person number."""
+        """Get the next available person number.
+        
+        Reads the AUTOINCREMENT counter from sqlite_sequence (a single-row
+        lookup) rather than scanning persons for MAX(id). This is the ID the
+        next inserted person will actually receive, even if the newest person
+        was deleted.
+        """
         conn = self.connect()
-        cursor = conn.execute("SELECT MAX(id) FROM persons")
-        result = cursor.fetchone()[0]
-        conn.commit()
-        return (result or 0) + 1
+        cursor = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'persons'")
+        row = cursor.fetchone()
+        return (row[0] if row else 0) + 1
     
     def _row_to_person(self, row: sqlite3.Row) -> Person:
         """Convert database row to Person object."""
         return Person(
             id=row["id"],
             name=row["name"],
-            centroid=pickle.loads(row["centroid"]),
+            centroid=row["centroid"],
             face_count=row["face_count"],
             created_at=row["created_at"],
         )
     
-    @retry_on_lock()
     def get_first_face_for_person(self, person_id: int) -> Optional[dict]:
         """Get the first face record for a person, along with the photo's processed path.
         
@@ -620,7 +1269,7 @@ class Database:
         """
         conn = self.connect()
         cursor = conn.execute(
-            """SELECT f.bbox_x, f.bbox_y, f.bbox_w, f.bbox_h, p.processed_path
+            """SELECT f.bbox, p.processed_path
                FROM faces f
                JOIN photos p ON f.photo_id = p.id
                WHERE f.person_id = ? AND p.processed_path IS NOT NULL
@@ -629,12 +1278,12 @@ class Database:
             (person_id,)
         )
         row = cursor.fetchone()
-        conn.commit()
         if row:
+            bbox_x, bbox_y, bbox_w, bbox_h = _unpack_bbox(row[0])
             return {
-                "bbox_x": row[0], "bbox_y": row[1],
-                "bbox_w": row[2], "bbox_h": row[3],
-                "processed_path": row[4]
+                "bbox_x": bbox_x, "bbox_y": bbox_y,
+                "bbox_w": bbox_w, "bbox_h": bbox_h,
+                "processed_path": row[1]
             }
         return None
 
@@ -642,28 +1291,25 @@ class Database:
     # VIP Pin Operations
     # =========================================================================
 
-    @retry_on_lock()
     def pin_person(self, person_id: int, label: Optional[str] = None) -> None:
         """Mark a person cluster as VIP (pinned to top of admin list)."""
         conn = self.connect()
-        with conn:
+        with self._write_lock:
             conn.execute(
-                """INSERT OR REPLACE INTO vip_pins (person_id, label, pinned_at)
-                   VALUES (?, ?, ?)""",
-                (person_id, label, datetime.now())
+                """INSERT OR REPLACE INTO vip_pins (person_id, label)
+                   VALUES (?, ?)""",
+                (person_id, label)
             )
 
-    @retry_on_lock()
     def unpin_person(self, person_id: int) -> None:
         """Remove VIP pin from a person cluster."""
         conn = self.connect()
-        with conn:
+        with self._write_lock:
             conn.execute(
                 "DELETE FROM vip_pins WHERE person_id = ?",
                 (person_id,)
             )
 
-    @retry_on_lock()
     def is_person_pinned(self, person_id: int) -> bool:
         """Check whether a person has a VIP pin."""
         conn = self.connect()
@@ -672,25 +1318,21 @@ class Database:
             (person_id,)
         )
         result = cursor.fetchone() is not None
-        conn.commit()
         return result
 
-    @retry_on_lock()
     def get_pinned_person_ids(self) -> List[int]:
         """Return all pinned person IDs ordered by pin time."""
-        conn = self.connect()
-        cursor = conn.execute(
-            "SELECT person_id FROM vip_pins ORDER BY pinned_at ASC"
-        )
-        rows = cursor.fetchall()
-        conn.commit()
+        with self._read_conn() as conn:
+            cursor = conn.execute(
+                "SELECT person_id FROM vip_pins ORDER BY pinned_at ASC"
+            )
+            rows = cursor.fetchall()
         return [row[0] for row in rows]
 
     # =========================================================================
     # Enrollment Operations
     # =========================================================================
     
-    @retry_on_lock()
     def create_enrollment(
         self,
         person_id: int,
@@ -703,53 +1345,58 @@ class Database:
     ) -> int:
         """Create a new enrollment record linking a user to a person cluster."""
         conn = self.connect()
-        with conn:
+        with self._write_lock:
             cursor = conn.execute(
                 """INSERT INTO enrollments 
-                   (person_id, user_name, phone, email, selfie_path, match_confidence, consent_given, created_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (person_id, user_name, phone, email, selfie_path, match_confidence, consent_given, datetime.now())
+                   (person_id, user_name, phone, email, selfie_path, match_confidence, consent_given)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (person_id, user_name, phone, email, selfie_path, match_confidence, consent_given)
             )
             return cursor.lastrowid
     
-    @retry_on_lock()
     def get_enrollment_by_person(self, person_id: int) -> Optional[Enrollment]:
-        """Get enrollment for a person if exists."""
+        """Get enrollment for a person if exists (at most one, enforced by a unique index)."""
         conn = self.connect()
         cursor = conn.execute(
             "SELECT * FROM enrollments WHERE person_id = ?",
             (person_id,)
         )
         row = cursor.fetchone()
-        conn.commit()
         return self._row_to_enrollment(row) if row else None
     
-    @retry_on_lock()
     def get_all_enrollments(self) -> List[Enrollment]:
         """Get all enrollments."""
-        conn = self.connect()
-        cursor = conn.execute("SELECT * FROM enrollments ORDER BY created_at DESC")
-        rows = cursor.fetchall()
-        conn.commit()
+        with self._read_conn() as conn:
+            cursor = conn.execute("SELECT * FROM enrollments ORDER BY created_at DESC, id DESC")
+            rows = cursor.fetchall()
         return [self._row_to_enrollment(row) for row in rows]
     
-    @retry_on_lock()
+    def get_enrollment_overview(self) -> Tuple[int, List[Enrollment]]:
+        """Get the person total and all enrollments from one consistent read."""
+        with self._read_conn() as conn:
+            rows = conn.execute(GET_ENROLLMENT_OVERVIEW_SQL).fetchall()
+        total_persons = rows[0]["total_persons"] or 0
+        return total_persons, [self._row_to_enrollment(row) for row in rows if row["id"] is not None]
+    
     def is_person_enrolled(self, person_id: int) -> bool:
-        """Check if a person has been enrolled."""
+        """Check if a person has been enrolled.
+        
+        Answered from the unique index alone. Callers that also need the
+        enrollment itself should call get_enrollment_by_person() instead.
+        """
         conn = self.connect()
         cursor = conn.execute(
-            "SELECT 1 FROM enrollments WHERE person_id = ?",
+            "SELECT 1 FROM enrollments WHERE person_id = ? LIMIT 1",
             (person_id,)
         )
         result = cursor.fetchone() is not None
-        conn.commit()
         return result
     
-    @retry_on_lock()
     def update_person_name(self, person_id: int, new_name: str) -> None:
         """Update the name of a person cluster."""
         conn = self.connect()
-        with conn:
+        self._invalidate_caches()
+        with self._write_lock:
             conn.execute(
                 "UPDATE persons SET name = ? WHERE id = ?",
                 (new_name, person_id)
@@ -773,34 +1420,30 @@ class Database:
     # Upload Queue Operations
     # =========================================================================
     
-    @retry_on_lock()
     def enqueue_upload(self, photo_id: int, local_path: str, relative_to: str) -> int:
         """Add a file to the upload queue."""
         conn = self.connect()
-        with conn:
+        with self._write_lock:
             cursor = conn.execute(
-                """INSERT INTO upload_queue (photo_id, local_path, relative_to, status, created_at, updated_at)
-                   VALUES (?, ?, ?, 'pending', ?, ?)""",
-                (photo_id, local_path, relative_to, datetime.now(), datetime.now())
+                """INSERT INTO upload_queue (photo_id, local_path, relative_to, status)
+                   VALUES (?, ?, ?, 'pending')""",
+                (photo_id, local_path, relative_to)
             )
             return cursor.lastrowid
     
-    @retry_on_lock()
-    def get_pending_uploads(self, limit: int = 10) -> List[dict]:
-        """Get pending uploads from the queue."""
+    def claim_pending_uploads(self, limit: int = 10) -> List[dict]:
+        """Mark the oldest pending uploads as 'uploading' and return them.
+        
+        Selecting and claiming happen in one UPDATE ... RETURNING, so two
+        uploaders can never pick the same row and callers don't need a
+        separate update_upload_status(id, 'uploading') per item.
+        """
         conn = self.connect()
-        cursor = conn.execute(
-            """SELECT * FROM upload_queue 
-               WHERE status = 'pending' 
-               ORDER BY created_at 
-               LIMIT ?""",
-            (limit,)
-        )
-        rows = cursor.fetchall()
-        conn.commit()
-        return [dict(row) for row in rows]
+        with self._write_lock:
+            rows = conn.execute(CLAIM_PENDING_UPLOADS_SQL, (limit,)).fetchall()
+        # RETURNING doesn't preserve the subquery's order
+        return sorted((dict(row) for row in rows), key=lambda upload: upload["id"])
     
-    @retry_on_lock()
     def update_upload_status(
         self, 
         upload_id: int, 
@@ -810,23 +1453,18 @@ class Database:
     ) -> None:
         """Update upload status."""
         conn = self.connect()
-        with conn:
+        with self._write_lock:
             if increment_retry:
                 conn.execute(
-                    """UPDATE upload_queue 
-                       SET status = ?, last_error = ?, retry_count = retry_count + 1, updated_at = ?
-                       WHERE id = ?""",
-                    (status, error, datetime.now(), upload_id)
+                    UPDATE_UPLOAD_STATUS_RETRY_SQL,
+                    (status, error, upload_id)
                 )
             else:
                 conn.execute(
-                    """UPDATE upload_queue 
-                       SET status = ?, last_error = ?, updated_at = ?
-                       WHERE id = ?""",
-                    (status, error, datetime.now(), upload_id)
+                    UPDATE_UPLOAD_STATUS_SQL,
+                    (status, error, upload_id)
                 )
     
-    @retry_on_lock()
     def get_failed_uploads(self, max_retries: int = 5) -> List[dict]:
         """Get failed uploads that haven't exceeded max retries."""
         conn = self.connect()
@@ -837,65 +1475,67 @@ class Database:
             (max_retries,)
         )
         rows = cursor.fetchall()
-        conn.commit()
         return [dict(row) for row in rows]
     
-    @retry_on_lock()
     def get_upload_stats(self) -> dict:
         """Get upload queue statistics."""
-        conn = self.connect()
-        cursor = conn.execute(
-            "SELECT status, COUNT(*) FROM upload_queue GROUP BY status"
-        )
-        rows = cursor.fetchall()
-        conn.commit()
+        with self._read_conn() as conn:
+            cursor = conn.execute(
+                "SELECT status, COUNT(*) FROM upload_queue GROUP BY status"
+            )
+            rows = cursor.fetchall()
         return dict(rows)
     
-    @retry_on_lock()
     def get_upload_stats_unique(self) -> dict:
         """Get upload queue statistics counting unique photos vs total files."""
-        conn = self.connect()
-        stats = {}
-        
-        # Total file copies by status
-        cursor = conn.execute(
-            "SELECT status, COUNT(*) FROM upload_queue GROUP BY status"
-        )
-        stats['by_status'] = dict(cursor.fetchall())
+        stats = {'by_status': {}, 'unique_by_status': {}}
         
-        # Unique photos by status
-        cursor = conn.execute(
-            """SELECT status, COUNT(DISTINCT photo_id)
-               FROM upload_queue GROUP BY status"""
-        )
-        stats['unique_by_status'] = dict(cursor.fetchall())
+        # Total file copies and unique photos by status, in one scan
+        with self._read_conn() as conn:
+            cursor = conn.execute(
+                """SELECT status, COUNT(*), COUNT(DISTINCT photo_id)
+                   FROM upload_queue GROUP BY status"""
+            )
+            for status, total, unique in cursor:
+                stats['by_status'][status] = total
+                stats['unique_by_status'][status] = unique
         
-        conn.commit()
         return stats
     
-    @retry_on_lock()
-    def update_upload_paths(self, old_folder_name: str, new_folder_name: str) -> int:
+    def update_upload_paths(
+        self,
+        old_folder_name: str,
+        new_folder_name: str,
+        people_dir: Optional[Path] = None
+    ) -> int:
         """
         Update local_path in pending/failed uploads when a person folder is renamed.
         
-        Replaces occurrences of the old folder name with the new one in any
-        uploads that haven't completed yet, so the uploader can find the files
-        at their new location.
+        Rewrites the People/<old_folder_name>/ path prefix to the new folder
+        name in any uploads that haven't completed yet, so the uploader can
+        find the files at their new location. Matching is a prefix range on the
+        indexed local_path column, so other folders whose names merely contain
+        the old name (e.g. Person_0012 vs Person_001) are left alone.
         
         Returns the number of rows updated.
         """
+        people_dir = people_dir or get_config().people_dir
+        old_prefix = str(Path(people_dir) / old_folder_name) + os.sep
+        new_prefix = str(Path(people_dir) / new_folder_name) + os.sep
+        # Smallest string greater than every string starting with old_prefix
+        prefix_end = old_prefix[:-1] + chr(ord(os.sep) + 1)
+        
         conn = self.connect()
-        with conn:
+        with self._write_lock:
             cursor = conn.execute(
-                """UPDATE upload_queue 
-                   SET local_path = REPLACE(local_path, ?, ?), updated_at = ?
-                   WHERE status IN ('pending', 'failed')
-                     AND local_path LIKE ?""",
-                (old_folder_name, new_folder_name, datetime.now(), f"%{old_folder_name}%")
+                """UPDATE upload_queue INDEXED BY idx_upload_queue_local_path
+                   SET local_path = ? || substr(local_path, ?), updated_at = CURRENT_TIMESTAMP
+                   WHERE local_path >= ? AND local_path < ?
+                     AND status IN ('pending', 'failed')""",
+                (new_prefix, len(old_prefix) + 1, old_prefix, prefix_end)
             )
             return cursor.rowcount
     
-    @retry_on_lock()
     def reset_stuck_uploads(self, timeout_minutes: int = 5) -> int:
         """Reset uploads stuck in 'uploading' status back to 'pending'.
         
@@ -908,18 +1548,13 @@ class Database:
         Returns:
             Number of uploads reset.
         """
-        conn = self.connect()
-        with conn:
-            cursor = conn.execute(
-                """UPDATE upload_queue 
-                   SET status = 'pending', last_error = 'Reset: stuck in uploading', updated_at = ?
-                   WHERE status = 'uploading' 
-                     AND updated_at < datetime('now', ? || ' minutes')""",
-                (datetime.now(), f"-{timeout_minutes}")
-            )
-            return cursor.rowcount
+        with self.transaction() as conn:
+            cursor = conn.execute(RESET_STUCK_UPLOADS_SQL, (f"-{timeout_minutes} minutes",))
+            upload_ids = [row[0] for row in cursor]
+        if upload_ids:
+            logger.debug(f"Reset stuck upload(s): {upload_ids}")
+        return len(upload_ids)
     
-    @retry_on_lock()
     def reset_stuck_processing_live(self, timeout_minutes: int = 10) -> int:
         """Reset photos stuck in 'processing' status back to 'pending' during live operation.
         
@@ -933,79 +1568,90 @@ class Database:
         Returns:
             Number of photos reset.
         """
-        conn = self.connect()
-        with conn:
+        with self.transaction() as conn:
             # Use processed_at or created_at to check staleness
             # Photos in 'processing' have processed_at = NULL, so use created_at
-            cursor = conn.execute(
-                """UPDATE photos 
-                   SET status = 'pending'
-                   WHERE status = 'processing' 
-                     AND created_at < datetime('now', ? || ' minutes')""",
-                (f"-{timeout_minutes}",)
-            )
-            count = cursor.rowcount
+            cursor = conn.execute(RESET_STUCK_PROCESSING_SQL, (f"-{timeout_minutes} minutes",))
+            photo_ids = [row[0] for row in cursor]
+        if photo_ids:
+            logger.debug(f"Reset stuck photo(s): {photo_ids}")
+        return len(photo_ids)
+    
+    def reset_specific_stuck(self, photo_ids: List[int]) -> None:
+        """Reset the given photos back to 'pending' in one transaction.
         
-        if count > 0:
-            logger.warning(f"Reset {count} photo(s) stuck in 'processing' for >{timeout_minutes}min back to 'pending'")
-        return count
+        Uses executemany over one fixed statement instead of an IN (...) list,
+        whose SQL text changes with the number of IDs and defeats the
+        statement cache.
+        """
+        with self.transaction() as conn:
+            conn.executemany(RESET_PHOTO_PENDING_SQL, [(photo_id,) for photo_id in photo_ids])
+    
+    def reset_all_stuck(self, upload_timeout: int = 5, processing_timeout: int = 10) -> Tuple[int, int]:
+        """Reset stuck uploads and stuck processing photos in one transaction.
+        
+        For housekeeping passes that run both resets: one commit instead of two.
+        
+        Returns:
+            (uploads_reset, photos_reset)
+        """
+        with self.transaction():
+            uploads_reset = self.reset_stuck_uploads(upload_timeout)
+            photos_reset = self.reset_stuck_processing_live(processing_timeout)
+        return uploads_reset, photos_reset
     
     # =========================================================================
     # Statistics
     # =========================================================================
     
-    @retry_on_lock()
     def get_stats(self) -> dict:
         """Get processing statistics."""
-        conn = self.connect()
-        stats = {}
+        stats = {"photos_by_status": {}}
+        counters = {}
         
-        # Photo counts by status
-        cursor = conn.execute(
-            "SELECT status, COUNT(*) FROM photos GROUP BY status"
-        )
-        stats["photos_by_status"] = dict(cursor.fetchall())
-        
-        # Total faces and persons
-        try:
-            cursor = conn.execute("SELECT COUNT(*) FROM faces")
-            stats["total_faces"] = cursor.fetchone()[0]
-        except (TypeError, IndexError):
-            stats["total_faces"] = 0
-        
-        try:
-            cursor = conn.execute("SELECT COUNT(*) FROM persons")
-            stats["total_persons"] = cursor.fetchone()[0]
-        except (TypeError, IndexError):
-            stats["total_persons"] = 0
+        # Photo counts by status and the trigger-maintained totals in one statement
+        with self._read_conn() as conn:
+            for kind, name, value in conn.execute(GET_STATS_SQL):
+                if kind == "status":
+                    stats["photos_by_status"][name] = value
+                else:
+                    counters[name] = value
         
-        # Total enrollments
-        try:
-            cursor = conn.execute("SELECT COUNT(*) FROM enrollments")
-            stats["total_enrollments"] = cursor.fetchone()[0]
-        except (TypeError, IndexError):
-            stats["total_enrollments"] = 0
+        stats["total_faces"] = counters.get("faces", 0)
+        stats["total_persons"] = counters.get("persons", 0)
+        stats["total_enrollments"] = counters.get("enrollments", 0)
         
-        conn.commit()
         return stats
 
 
 # Global database instance
 _db: Database | None = None
+_db_lock = threading.Lock()
 
 
 def get_db() -> Database:
-    """Get the global database instance."""
+    """Get the global database instance.
+    
+    Double-checked locking: after the first call this is a plain attribute
+    read, while concurrent first calls can't both create and initialize it.
+    """
     global _db
-    if _db is None:
-        _db = Database()
-        _db.initialize()
-    return _db
+    db = _db  # Single global load on the hot path
+    if db is not None:
+        return db
+    with _db_lock:
+        if _db is None:
+            db = Database()
+            db.initialize()
+            # Publish only once fully initialized
+            _db = db
+        return _db
 
 
 def reset_db() -> None:
     """Reset the global database (useful for testing)."""
     global _db
-    if _db:
-        _db.close()
-    _db = None
+    with _db_lock:
+        if _db:
+            _db.close()
+        _db = None
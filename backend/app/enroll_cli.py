@@ -5,20 +5,31 @@ Simple command-line interface to enroll users via selfie.
 
 Usage:
     python -m app.enroll_cli <selfie_path> <user_name> [--phone PHONE] [--email EMAIL]
+    python -m app.enroll_cli --batch <selfie_dir>
+    python -m app.enroll_cli --server <socket_path>
+    python -m app.enroll_cli <selfie_path> <user_name> --socket <socket_path>
 
 Examples:
     python -m app.enroll_cli selfie.jpg "John Doe"
     python -m app.enroll_cli selfie.jpg "Jane Smith" --phone "+1234567890" --email "jane@email.com"
+    python -m app.enroll_cli --batch selfies/    # selfies/John_Doe.jpg -> "John Doe"
+    python -m app.enroll_cli --server /tmp/aura_enroll.sock &
+    python -m app.enroll_cli selfie.jpg "John Doe" --socket /tmp/aura_enroll.sock
 """
 
 import argparse
+import json
 import logging
+import socket
+import socketserver
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 
-from .config import get_config
-from .db import get_db
-from .enrollment import enroll_user, get_enrollment_status
+# Everything from the app (config, database, detector stack) is imported inside
+# the functions that use it, so a --socket client only loads the stdlib.
+
+logger = logging.getLogger(__name__)
 
 
 def setup_logging(level: str = "INFO"):
@@ -30,6 +41,150 @@ def setup_logging(level: str = "INFO"):
     )
 
 
+def enroll_batch(selfie_dir: Path, config) -> int:
+    """
+    Enroll every selfie in a directory, named after its file.
+    Example: "John_Doe.jpg" -> "John Doe"
+    
+    Runs in one process, so the face model and database are loaded once for
+    the whole batch instead of once per CLI invocation.
+    """
+    from .enrollment import enroll_user
+    
+    if not selfie_dir.is_dir():
+        print(f"Error: Selfie directory not found: {selfie_dir}")
+        return 1
+    
+    selfies = sorted(
+        p for p in selfie_dir.iterdir()
+        if p.is_file() and p.suffix.lower() in config.supported_extensions
+    )
+    if not selfies:
+        print(f"Error: No selfies found in: {selfie_dir}")
+        return 1
+    
+    print(f"\n🎯 Enrolling {len(selfies)} selfie(s) from: {selfie_dir}")
+    print("-" * 50)
+    
+    failed = 0
+    for selfie in selfies:
+        name = selfie.stem.replace("_", " ").strip()
+        result = enroll_user(selfie_path=selfie, user_name=name)
+        if result.success:
+            print(f"✅ {name} -> {result.person_name} ({result.match_confidence:.1%})")
+        else:
+            failed += 1
+            print(f"❌ {name}: {result.message}")
+    
+    print()
+    print(f"Enrolled {len(selfies) - failed} of {len(selfies)} selfie(s)")
+    return 1 if failed else 0
+
+
+class EnrollRequestHandler(socketserver.StreamRequestHandler):
+    """Serve one enrollment: a JSON line in, a JSON line out."""
+    
+    def handle(self):
+        from .enrollment import enroll_user
+        
+        try:
+            request = json.loads(self.rfile.readline())
+            result = enroll_user(
+                selfie_path=Path(request["selfie"]),
+                user_name=request["name"],
+                phone=request.get("phone"),
+                email=request.get("email")
+            )
+            reply = {
+                "success": result.success,
+                "person_id": result.person_id,
+                "person_name": result.person_name,
+                "match_confidence": result.match_confidence,
+                "message": result.message,
+                "solo_folder": str(result.solo_folder) if result.solo_folder else None,
+                "group_folder": str(result.group_folder) if result.group_folder else None,
+            }
+        except Exception as e:
+            logger.error(f"Bad enrollment request: {e}")
+            reply = {
+                "success": False,
+                "person_id": None,
+                "person_name": None,
+                "match_confidence": 0.0,
+                "message": f"Bad request: {e}",
+                "solo_folder": None,
+                "group_folder": None,
+            }
+        
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+def serve_enrollments(socket_path: Path) -> int:
+    """
+    Keep the face model loaded and enroll requests sent to a UNIX socket.
+    
+    Requests are handled one at a time on this thread, so the analyzer
+    warmed up here is the one every enrollment uses.
+    """
+    if not hasattr(socketserver, "UnixStreamServer"):
+        print("Error: --server needs UNIX domain sockets, which this platform lacks")
+        return 1
+    
+    import numpy as np
+    from .processor import _get_face_analyzer, detect_faces
+    
+    # Build the analyzer (raising if the model can't load), then run one
+    # detection on a blank frame so every ONNX session has executed once and
+    # the first real request doesn't pay for kernel setup
+    print("Loading face model...")
+    _get_face_analyzer()
+    detect_faces(Path("warmup"), image=np.zeros((640, 640, 3), dtype=np.uint8))
+    
+    socket_path.unlink(missing_ok=True)  # Left behind by a killed server
+    with socketserver.UnixStreamServer(str(socket_path), EnrollRequestHandler) as server:
+        print(f"🎯 Enrollment server listening on: {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+    
+    print("Enrollment server stopped")
+    return 0
+
+
+def send_enrollment(socket_path: Path, request: dict) -> SimpleNamespace:
+    """Forward an enrollment to a running --server and return its result."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reply:
+            return SimpleNamespace(**json.loads(reply.readline()))
+
+
+def print_result(result) -> int:
+    """Display an enrollment result and return the process exit code."""
+    print()
+    if result.success:
+        print("✅ ENROLLMENT SUCCESSFUL!")
+        print(f"   Person ID: {result.person_id}")
+        print(f"   Folder Name: {result.person_name}")
+        print(f"   Match Confidence: {result.match_confidence:.1%}")
+        if result.solo_folder:
+            print(f"   Solo Photos: {result.solo_folder}")
+        if result.group_folder:
+            print(f"   Group Photos: {result.group_folder}")
+    else:
+        print("❌ ENROLLMENT FAILED")
+        print(f"   Reason: {result.message}")
+        if result.match_confidence > 0:
+            print(f"   Best Match Confidence: {result.match_confidence:.1%}")
+        return 1
+    
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Enroll a user by matching their selfie to event photos",
@@ -40,15 +195,41 @@ def main():
     parser.add_argument(
         "selfie",
         type=Path,
+        nargs="?",
         help="Path to selfie image"
     )
     
     parser.add_argument(
         "name",
         type=str,
+        nargs="?",
         help="User's display name (e.g., 'John Doe')"
     )
     
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        metavar="DIR",
+        default=None,
+        help="Enroll every selfie in DIR, named after its file (John_Doe.jpg -> 'John Doe')"
+    )
+    
+    parser.add_argument(
+        "--server",
+        type=Path,
+        metavar="SOCKET",
+        default=None,
+        help="Keep the face model loaded and serve enrollments on a UNIX socket"
+    )
+    
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        metavar="SOCKET",
+        default=None,
+        help="Send the enrollment to a running --server instead of loading the model here"
+    )
+    
     parser.add_argument(
         "--phone",
         type=str,
@@ -79,6 +260,32 @@ def main():
     
     # Setup
     setup_logging("DEBUG" if args.verbose else "INFO")
+    
+    if args.socket and not (args.status or args.batch or args.server):
+        if args.selfie is None or args.name is None:
+            parser.error("selfie and name are required with --socket")
+        if not args.selfie.exists():
+            print(f"Error: Selfie file not found: {args.selfie}")
+            return 1
+        print(f"\n🎯 Enrolling '{args.name}' via server: {args.socket}")
+        print("-" * 50)
+        try:
+            result = send_enrollment(args.socket, {
+                # The server has its own working directory
+                "selfie": str(args.selfie.resolve()),
+                "name": args.name,
+                "phone": args.phone,
+                "email": args.email,
+            })
+        except OSError as e:
+            print(f"Error: Could not reach enrollment server at {args.socket}: {e}")
+            return 1
+        return print_result(result)
+    
+    from .config import get_config
+    from .db import get_db
+    from .enrollment import enroll_user, get_enrollment_status
+    
     config = get_config()
     config.ensure_directories()
     
@@ -99,6 +306,15 @@ def main():
                 print(f"  • {e['user_name']} (Person ID: {e['person_id']}, Confidence: {e['confidence']})")
         return 0
     
+    if args.server:
+        return serve_enrollments(args.server)
+    
+    if args.batch:
+        return enroll_batch(args.batch, config)
+    
+    if args.selfie is None or args.name is None:
+        parser.error("selfie and name are required unless --status, --batch or --server is given")
+    
     # Validate selfie path
     if not args.selfie.exists():
         print(f"Error: Selfie file not found: {args.selfie}")
@@ -114,26 +330,7 @@ def main():
         phone=args.phone,
         email=args.email
     )
-    
-    # Display result
-    print()
-    if result.success:
-        print("✅ ENROLLMENT SUCCESSFUL!")
-        print(f"   Person ID: {result.person_id}")
-        print(f"   Folder Name: {result.person_name}")
-        print(f"   Match Confidence: {result.match_confidence:.1%}")
-        if result.solo_folder:
-            print(f"   Solo Photos: {result.solo_folder}")
-        if result.group_folder:
-            print(f"   Group Photos: {result.group_folder}")
-    else:
-        print("❌ ENROLLMENT FAILED")
-        print(f"   Reason: {result.message}")
-        if result.match_confidence > 0:
-            print(f"   Best Match Confidence: {result.match_confidence:.1%}")
-        return 1
-    
-    return 0
+    return print_result(result)
 
 
 if __name__ == "__main__":
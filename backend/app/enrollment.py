@@ -9,9 +9,12 @@ Handles user enrollment via selfie:
 5. Save selfie as reference image in folder
 """
 
+import errno
 import logging
+import os
 import shutil
 import re
+from operator import attrgetter
 from pathlib import Path
 from typing import Optional, Tuple
 from dataclasses import dataclass
@@ -20,12 +23,16 @@ import numpy as np
 from PIL import Image
 
 from .config import get_config
-from .db import get_db, Person
-from .cluster import cosine_distance, find_nearest_person
+from .db import get_db
+from .cluster import find_nearest_centroid
 from .processor import detect_faces, fix_orientation
 
 logger = logging.getLogger(__name__)
 
+# Folder-name sanitizing patterns, compiled once
+_UNSAFE_CHARS_RE = re.compile(r'[^\w\s-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
 @dataclass
 class EnrollmentResult:
@@ -45,9 +52,9 @@ def sanitize_folder_name(name: str) -> str:
     Example: "John Doe" -> "John_Doe"
     """
     # Remove any characters that are not alphanumeric, space, or hyphen
-    clean = re.sub(r'[^\w\s-]', '', name)
+    clean = _UNSAFE_CHARS_RE.sub('', name)
     # Replace spaces with underscores
-    clean = re.sub(r'\s+', '_', clean.strip())
+    clean = _WHITESPACE_RE.sub('_', clean.strip())
     # Limit length
     return clean[:50] if clean else "Unknown"
 
@@ -68,11 +75,30 @@ def generate_unique_folder_name(base_name: str, person_id: int, config=None) ->
     return f"{base_name}_{person_id}"
 
 
+def _fsync_dir(path: Path) -> None:
+    """Flush a directory's entries (e.g. a rename) to disk. No-op on Windows.
+    
+    Best-effort: some filesystems (e.g. CIFS/SMB mounts) reject fsync on a
+    directory, and by then the rename has already happened, so errors are
+    logged rather than raised.
+    """
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logger.warning(f"Could not fsync directory {path}: {e}")
+
+
 def rename_person_folder(
     person_id: int, 
     new_name: str,
     config=None
-) -> Tuple[bool, Optional[Path], Optional[Path]]:
+) -> Tuple[bool, Optional[str], Optional[Path], Optional[Path]]:
     """
     Rename a person's folder from Person_XXX to the new name.
     
@@ -80,31 +106,41 @@ def rename_person_folder(
     any pending upload queue entries to use the new path.
     
     Returns:
-        (success, new_solo_path, new_group_path)
+        (success, new_folder_name, new_solo_path, new_group_path)
     """
     from .cloud import get_cloud
     
     config = config or get_config()
+    people_dir = config.people_dir
     db = get_db()
     
     # Get current folder name from database
     person = db.get_person_by_id(person_id)
     if person is None:
         logger.error(f"Person {person_id} not found in database")
-        return False, None, None
+        return False, None, None, None
     
     old_folder_name = person.name
-    old_folder_path = config.people_dir / old_folder_name
+    old_folder_path = people_dir / old_folder_name
     
     # Generate safe folder name
     safe_name = sanitize_folder_name(new_name)
     unique_name = generate_unique_folder_name(safe_name, person_id, config)
-    new_folder_path = config.people_dir / unique_name
+    new_folder_path = people_dir / unique_name
     
     try:
         if old_folder_path.exists():
-            # Rename the existing folder
-            shutil.move(str(old_folder_path), str(new_folder_path))
+            # Rename the existing folder. On the same filesystem this is an
+            # atomic rename that moves no data; only a cross-device move falls
+            # back to copy-and-delete. Any other error (e.g. a photo held open
+            # on Windows) fails instead of leaving a half-copied folder.
+            try:
+                os.rename(old_folder_path, new_folder_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(str(old_folder_path), str(new_folder_path))
+            _fsync_dir(people_dir)
             logger.info(f"Renamed folder: {old_folder_name} -> {unique_name}")
         else:
             # Create new folder structure if it doesn't exist
@@ -138,7 +174,7 @@ def rename_person_folder(
         
         # ---- FIX PENDING UPLOADS: Update paths in upload queue ----
         try:
-            updated_count = db.update_upload_paths(old_folder_name, unique_name)
+            updated_count = db.update_upload_paths(old_folder_name, unique_name, people_dir)
             if updated_count > 0:
                 logger.info(f"Updated {updated_count} pending upload paths: {old_folder_name} -> {unique_name}")
         except Exception as db_err:
@@ -147,11 +183,11 @@ def rename_person_folder(
         solo_path = new_folder_path / "Solo"
         group_path = new_folder_path / "Group"
         
-        return True, solo_path, group_path
+        return True, unique_name, solo_path, group_path
         
     except Exception as e:
         logger.error(f"Failed to rename folder {old_folder_name} -> {unique_name}: {e}")
-        return False, None, None
+        return False, None, None, None
 
 
 def save_reference_selfie(
@@ -167,16 +203,19 @@ def save_reference_selfie(
     """
     try:
         dest_path = person_folder / filename
+        max_size = 800
         
-        # Open, fix orientation, and save
+        # Open, fix orientation, and save. For JPEGs, draft() makes the decoder
+        # downscale by 1/2, 1/4 or 1/8 during the IDCT (never below max_size),
+        # so a phone selfie isn't decoded at full resolution just to shrink it.
         img = Image.open(selfie_path)
+        img.draft("RGB", (max_size, max_size))
         img = fix_orientation(img)
         
         if img.mode != "RGB":
             img = img.convert("RGB")
         
-        # Resize to reasonable size if needed
-        max_size = 800
+        # Resize to reasonable size if still needed
         if max(img.size) > max_size:
             ratio = max_size / max(img.size)
             new_size = (int(img.size[0] * ratio), int(img.size[1] * ratio))
@@ -264,7 +303,7 @@ def enroll_user(
         logger.warning(f"Multiple faces detected in selfie, using the most confident one")
     
     # Use the face with highest confidence
-    best_face = max(faces, key=lambda f: f.confidence)
+    best_face = max(faces, key=attrgetter("confidence"))
     selfie_embedding = best_face.embedding
     
     # Normalize embedding
@@ -272,10 +311,10 @@ def enroll_user(
     if norm > 0:
         selfie_embedding = selfie_embedding / norm
     
-    # Step 2: Find best matching person cluster
-    persons = db.get_all_persons()
+    # Step 2: Find best matching person cluster (one product over all centroids)
+    centroids, person_ids = db.get_all_centroids()
     
-    if not persons:
+    if not person_ids:
         return EnrollmentResult(
             success=False,
             person_id=None,
@@ -284,7 +323,8 @@ def enroll_user(
             message="No photos have been processed yet. Please wait for event photos to be uploaded."
         )
     
-    nearest_person, distance = find_nearest_person(selfie_embedding, persons)
+    index, distance = find_nearest_centroid(selfie_embedding, centroids, normalized=True)
+    nearest_person = db.get_person_by_id(person_ids[index])
     
     if nearest_person is None or distance >= match_threshold:
         # No good match found
@@ -298,8 +338,8 @@ def enroll_user(
         )
     
     # Check if this person is already enrolled
-    if db.is_person_enrolled(nearest_person.id):
-        existing = db.get_enrollment_by_person(nearest_person.id)
+    existing = db.get_enrollment_by_person(nearest_person.id)
+    if existing is not None:
         return EnrollmentResult(
             success=False,
             person_id=nearest_person.id,
@@ -312,7 +352,7 @@ def enroll_user(
     logger.info(f"Matched to {nearest_person.name} with confidence {match_confidence:.1%}")
     
     # Step 3: Rename folder to user's name
-    success, solo_path, group_path = rename_person_folder(
+    success, folder_name, solo_path, group_path = rename_person_folder(
         nearest_person.id, 
         user_name,
         config
@@ -327,10 +367,6 @@ def enroll_user(
             message="Failed to rename person folder"
         )
     
-    # Get updated person name (folder name)
-    updated_person = db.get_person_by_id(nearest_person.id)
-    folder_name = updated_person.name if updated_person else user_name
-    
     # Step 4: Save reference selfie in the person's folder
     person_folder = config.people_dir / folder_name
     saved_selfie_path = save_reference_selfie(selfie_path, person_folder)
@@ -362,17 +398,17 @@ def enroll_user(
 def get_enrollment_status() -> dict:
     """Get summary of enrollment status."""
     db = get_db()
-    config = get_config()
     
-    persons = db.get_all_persons()
-    enrollments = db.get_all_enrollments()
+    # Person total comes from the trigger-maintained counters, so only the
+    # (much shorter) enrollments list is actually read, in the same statement
+    total_persons, enrollments = db.get_enrollment_overview()
     
-    enrolled_ids = {e.person_id for e in enrollments}
+    enrolled_ids = {e.person_id for e in enrollments if e.person_id is not None}
     
     return {
-        "total_persons": len(persons),
+        "total_persons": total_persons,
         "total_enrolled": len(enrollments),
-        "pending_enrollment": len([p for p in persons if p.id not in enrolled_ids]),
+        "pending_enrollment": total_persons - len(enrolled_ids),
         "enrollments": [
             {
                 "id": e.id,
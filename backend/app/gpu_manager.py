@@ -150,6 +150,7 @@ class GPUInfo:
 class ExecutionConfig:
     """Configuration for InsightFace / ONNX Runtime execution."""
     providers: List[str] = field(default_factory=lambda: ["CPUExecutionProvider"])
+    provider_options: List[dict] = field(default_factory=lambda: [{}])  # One dict per provider
     ctx_id: int = -1               # -1 = CPU, 0 = GPU device 0
     mode: str = "CPU"              # Human-readable: "CPU" or "GPU (RTX 4070)"
 
@@ -573,6 +574,17 @@ def get_execution_config(gpu_enabled: bool = False,
             gpu_label = hw.gpu_name if hw else "GPU"
             return ExecutionConfig(
                 providers=["CUDAExecutionProvider", "CPUExecutionProvider"],
+                # InsightFace's prepare(ctx_id) doesn't pick the device, so it
+                # has to be passed to the CUDA provider. Each worker thread
+                # holds its own sessions; growing the arena only by what is
+                # requested keeps them from reserving VRAM in doubling steps.
+                provider_options=[
+                    {
+                        "device_id": gpu_device_id,
+                        "arena_extend_strategy": "kSameAsRequested",
+                    },
+                    {},
+                ],
                 ctx_id=gpu_device_id,
                 mode=f"GPU ({gpu_label})",
             )
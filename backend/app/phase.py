@@ -19,6 +19,7 @@ Flow:
   6. Repeat.
 """
 
+import itertools
 import logging
 import os
 import threading
@@ -54,19 +55,21 @@ class PhaseCoordinator:
     
     def __init__(self):
         self._lock = threading.Lock()
+        # Notified on every phase switch. The upload worker waits on the phase
+        # itself, so there is no separate flag that could drift out of sync.
+        self._phase_changed = threading.Condition(self._lock)
         self._phase = Phase.PROCESSING
-        self._photos_processed_in_batch = 0
+        # Free-running tick counter; the batch count is the distance from
+        # _counter_base. next() on itertools.count is atomic under the GIL, so
+        # workers can draw a tick without taking the lock. _last_tick is the
+        # highest tick stored so far (under the lock), kept so readers never
+        # have to draw one.
+        self._counter = itertools.count(1)
+        self._counter_base = 0
+        self._last_tick = 0
         self._batch_size = int(os.getenv('PROCESS_BATCH_SIZE', '20'))
         self._total_batches_completed = 0
         
-        # Event that processing workers wait on when paused
-        self._processing_allowed = threading.Event()
-        self._processing_allowed.set()  # Start in PROCESSING phase
-        
-        # Event that upload worker waits on when not its turn
-        self._uploading_allowed = threading.Event()
-        self._uploading_allowed.clear()  # Upload not allowed initially
-        
         logger.info(
             f"Phase Coordinator initialized: batch_size={self._batch_size}, "
             f"starting phase=PROCESSING"
@@ -85,7 +88,12 @@ class PhaseCoordinator:
     @property
     def photos_in_current_batch(self) -> int:
         """How many photos have been processed in the current batch."""
-        return self._photos_processed_in_batch
+        with self._lock:
+            return self._batch_count()
+    
+    def _batch_count(self) -> int:
+        """Current batch count, read without touching the counter. Caller must hold the lock."""
+        return self._last_tick - self._counter_base
     
     def can_process(self, timeout: float = 1.0) -> bool:
         """
@@ -107,25 +115,34 @@ class PhaseCoordinator:
         Called after a photo is successfully processed (or errored out).
         Increments the batch counter and triggers phase switch if batch is full.
         """
+        tick = next(self._counter)
         with self._lock:
-            self._photos_processed_in_batch += 1
-            count = self._photos_processed_in_batch
-            batch = self._batch_size
+            # Workers can finish out of order; never let a slower one move
+            # _last_tick back, or the batch count would go backwards
+            if tick > self._last_tick:
+                self._last_tick = tick
+            count = tick - self._counter_base
+        batch = self._batch_size
         
         # batch_size=0 means "no batching, keep uploading continuously".
         # We do NOT switch to uploading on every photo — the flush loop handles
         # it when the job queue goes idle.
-        if batch > 0 and count >= batch:
+        # The unlocked phase check keeps photos finishing during the upload
+        # phase off the lock; _switch_to_uploading() re-checks under it, so
+        # only the first worker past the limit actually switches.
+        if batch > 0 and count >= batch and self._phase is Phase.PROCESSING:
             self._switch_to_uploading()
     
     def _switch_to_uploading(self) -> None:
         """Switch from PROCESSING to UPLOADING phase."""
-        with self._lock:
+        with self._phase_changed:
             if self._phase == Phase.UPLOADING:
                 return  # Already in uploading phase
             
-            count = self._photos_processed_in_batch
+            count = self._batch_count()
             self._phase = Phase.UPLOADING
+            # Signal upload worker to start
+            self._phase_changed.notify_all()
         
         logger.info(
             f"=== PHASE SWITCH: PROCESSING -> UPLOADING "
@@ -133,11 +150,8 @@ class PhaseCoordinator:
             f"[processing continues concurrently] ==="
         )
         
-        # NOTE: We do NOT pause processing workers (no _processing_allowed.clear()).
+        # NOTE: We do NOT pause processing workers.
         # Processing and uploading run concurrently for maximum throughput.
-        
-        # Signal upload worker to start
-        self._uploading_allowed.set()
     
     def should_upload(self, timeout: float = 2.0) -> bool:
         """
@@ -150,7 +164,10 @@ class PhaseCoordinator:
         Returns:
             True if uploading phase is active, False otherwise.
         """
-        return self._uploading_allowed.wait(timeout=timeout)
+        with self._phase_changed:
+            return self._phase_changed.wait_for(
+                lambda: self._phase == Phase.UPLOADING, timeout=timeout
+            )
     
     def flush_if_needed(self, pending_upload_count: int = 0) -> bool:
         """
@@ -176,14 +193,13 @@ class PhaseCoordinator:
             if self._phase == Phase.UPLOADING:
                 return False  # Already uploading
 
-            has_processed = self._photos_processed_in_batch > 0
+            count = self._batch_count()
+            has_processed = count > 0
             has_pending_uploads = pending_upload_count > 0
 
             if not has_processed and not has_pending_uploads:
                 return False  # Truly nothing to do
 
-            count = self._photos_processed_in_batch
-
         if has_pending_uploads and not has_processed:
             logger.info(
                 f"=== FLUSH: {pending_upload_count} pending upload(s) in DB from "
@@ -202,11 +218,17 @@ class PhaseCoordinator:
         Called when all pending uploads have been drained.
         Resets the batch counter and switches back to PROCESSING phase.
         """
-        with self._lock:
+        # Switching the phase back is what pauses the upload worker
+        with self._phase_changed:
             self._total_batches_completed += 1
             batch_num = self._total_batches_completed
-            self._photos_processed_in_batch = 0
+            # Start the next batch at the current tick; photos drawing later
+            # ticks count from 1
+            tick = next(self._counter)
+            self._counter_base = tick
+            self._last_tick = tick
             self._phase = Phase.PROCESSING
+            self._phase_changed.notify_all()
         
         logger.info(
             f"=== PHASE SWITCH: UPLOADING -> PROCESSING "
@@ -214,9 +236,6 @@ class PhaseCoordinator:
             f"[processing was never paused] ==="
         )
         
-        # Pause upload worker
-        self._uploading_allowed.clear()
-        
         # Processing workers were never paused, so no need to resume them
     
     def get_status(self) -> dict:
@@ -224,11 +243,11 @@ class PhaseCoordinator:
         with self._lock:
             return {
                 "phase": self._phase.value,
-                "photos_in_batch": self._photos_processed_in_batch,
+                "photos_in_batch": self._batch_count(),
                 "batch_size": self._batch_size,
                 "batches_completed": self._total_batches_completed,
-                "processing_allowed": self._processing_allowed.is_set(),
-                "uploading_allowed": self._uploading_allowed.is_set(),
+                "processing_allowed": True,  # Never paused in concurrent mode
+                "uploading_allowed": self._phase == Phase.UPLOADING,
             }
 
 
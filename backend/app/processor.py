@@ -7,13 +7,15 @@ face detection, and embedding extraction using InsightFace.
 
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 
 import cv2
 import numpy as np
-from PIL import Image, ExifTags
+from PIL import Image, ImageOps
 
 from .config import get_config
 
@@ -22,8 +24,12 @@ logger = logging.getLogger(__name__)
 # Thread-local storage for InsightFace analyzer (one per worker thread)
 _thread_local = threading.local()
 
+# Shared pool for image I/O that can run beside face detection
+_io_pool: Optional[ThreadPoolExecutor] = None
+_io_pool_lock = threading.Lock()
 
-@dataclass
+
+@dataclass(slots=True)
 class DetectedFace:
     """Represents a detected face with bounding box and embedding."""
     bbox: Tuple[int, int, int, int]  # x, y, width, height
@@ -54,10 +60,14 @@ def _get_face_analyzer():
                 f"Loading InsightFace model (buffalo_l) for thread {thread_name} "
                 f"— mode: {exec_config.mode}, root: {model_root}"
             )
+            # Only boxes, scores and embeddings are used; skipping the landmark
+            # and gender/age models saves three inferences per face
             analyzer = FaceAnalysis(
                 name="buffalo_l",
                 root=model_root,
-                providers=exec_config.providers
+                allowed_modules=["detection", "recognition"],
+                providers=exec_config.providers,
+                provider_options=exec_config.provider_options
             )
             analyzer.prepare(ctx_id=exec_config.ctx_id, det_size=(640, 640))
             _thread_local.face_analyzer = analyzer
@@ -77,74 +87,82 @@ def is_raw_file(file_path: Path) -> bool:
     return file_path.suffix.lower() in raw_extensions
 
 
-def convert_raw_to_jpeg(raw_path: Path, output_path: Path) -> bool:
+def _decode_raw(raw_path: Path, max_size: Optional[int] = None) -> Optional[Image.Image]:
     """
-    Convert RAW file to JPEG using rawpy.
-    Returns True on success, False on failure.
+    Demosaic a RAW file into an RGB image using rawpy.
+    With max_size, uses LibRaw's half-size mode (no interpolation, several
+    times faster) when half the sensor is still at least max_size across.
+    Returns None on failure.
     """
     try:
         import rawpy
         
         logger.debug(f"Converting RAW: {raw_path}")
         with rawpy.imread(str(raw_path)) as raw:
+            sizes = raw.sizes
+            half_size = max_size is not None and max(sizes.width, sizes.height) // 2 >= max_size
+            
             # Process with sensible defaults
             rgb = raw.postprocess(
                 use_camera_wb=True,
-                half_size=False,
+                half_size=half_size,
                 no_auto_bright=False,
                 output_bps=8
             )
         
-        # Save as JPEG
-        img = Image.fromarray(rgb)
-        img.save(output_path, "JPEG", quality=95)
-        logger.debug(f"RAW converted: {output_path}")
-        return True
+        return Image.fromarray(rgb)
         
     except ImportError:
         logger.error("rawpy not installed. Install with: pip install rawpy")
+        return None
+    except Exception as e:
+        logger.error(f"RAW conversion failed for {raw_path}: {e}")
+        return None
+
+
+def convert_raw_to_jpeg(raw_path: Path, output_path: Path) -> bool:
+    """
+    Convert RAW file to JPEG using rawpy.
+    Returns True on success, False on failure.
+    """
+    img = _decode_raw(raw_path)
+    if img is None:
         return False
+    
+    try:
+        # Save as JPEG
+        img.save(output_path, "JPEG", quality=95)
+        logger.debug(f"RAW converted: {output_path}")
+        return True
     except Exception as e:
         logger.error(f"RAW conversion failed for {raw_path}: {e}")
         return False
 
 
+# EXIF Orientation tag and the exact transpose that undoes each value
+_ORIENTATION_TAG = 0x0112
+_ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+
 def fix_orientation(image: Image.Image) -> Image.Image:
     """Fix image orientation based on EXIF data."""
     try:
-        exif = image._getexif()
-        if exif is None:
+        # getexif() only reads the base IFD, which holds Orientation; most
+        # images have no tag or the upright value 1 and return untouched.
+        method = _ORIENTATION_TRANSPOSE.get(image.getexif().get(_ORIENTATION_TAG, 1))
+        if method is None:
             return image
         
-        # Find orientation tag
-        orientation_key = None
-        for key, val in ExifTags.TAGS.items():
-            if val == "Orientation":
-                orientation_key = key
-                break
-        
-        if orientation_key is None or orientation_key not in exif:
-            return image
-        
-        orientation = exif[orientation_key]
-        
-        # Apply rotation/flip based on orientation
-        if orientation == 2:
-            image = image.transpose(Image.FLIP_LEFT_RIGHT)
-        elif orientation == 3:
-            image = image.rotate(180)
-        elif orientation == 4:
-            image = image.transpose(Image.FLIP_TOP_BOTTOM)
-        elif orientation == 5:
-            image = image.rotate(-90, expand=True).transpose(Image.FLIP_LEFT_RIGHT)
-        elif orientation == 6:
-            image = image.rotate(-90, expand=True)
-        elif orientation == 7:
-            image = image.rotate(90, expand=True).transpose(Image.FLIP_LEFT_RIGHT)
-        elif orientation == 8:
-            image = image.rotate(90, expand=True)
-        
-        return image
+        # transpose() reorders pixels exactly; rotate() would resample
+        return image.transpose(method)
     except Exception as e:
         logger.debug(f"Could not fix orientation: {e}")
         return image
@@ -197,13 +215,25 @@ def normalize_image(
     Supports: JPEG, PNG, BMP, TIFF, WebP, AVIF, HEIC/HEIF, and all camera RAW formats.
     Returns True on success.
     """
+    return _normalize(input_path, output_path, max_size) is not None
+
+
+def _normalize(
+    input_path: Path,
+    output_path: Path,
+    max_size: int
+) -> Optional[Image.Image]:
+    """
+    normalize_image(), but returns the normalized RGB image (or None on
+    failure) so later steps can reuse its pixels instead of re-decoding.
+    """
     try:
         # Handle RAW files
         if is_raw_file(input_path):
-            if not convert_raw_to_jpeg(input_path, output_path):
-                return False
-            # Re-open the converted file for further processing
-            img = Image.open(output_path)
+            # Demosaic straight to pixels; they are saved once, after resizing
+            img = _decode_raw(input_path, max_size)
+            if img is None:
+                return None
         else:
             # Enable modern format support
             _enable_modern_formats()
@@ -211,6 +241,15 @@ def normalize_image(
             # Open image (PIL will handle AVIF/WebP/HEIC if plugins are installed)
             img = Image.open(input_path)
         
+        # For JPEGs, let the decoder downscale by 1/2, 1/4 or 1/8 during the
+        # IDCT. Asking for the final size keeps the decoded image at least that
+        # big, so the LANCZOS resize below still sets the exact dimensions.
+        if img.format == "JPEG" and max(img.size) > max_size:
+            ratio = max_size / max(img.size)
+            # Clamp so an extreme panorama's short side can't round to 0
+            img.draft("RGB", (max(1, int(img.size[0] * ratio)),
+                              max(1, int(img.size[1] * ratio))))
+        
         # Fix orientation
         img = fix_orientation(img)
         
@@ -221,67 +260,127 @@ def normalize_image(
         # Resize if needed
         if max(img.size) > max_size:
             ratio = max_size / max(img.size)
-            new_size = (int(img.size[0] * ratio), int(img.size[1] * ratio))
+            new_size = (max(1, int(img.size[0] * ratio)), max(1, int(img.size[1] * ratio)))
             img = img.resize(new_size, Image.LANCZOS)
         
         # Save as JPEG
         img.save(output_path, "JPEG", quality=95)
         logger.debug(f"Normalized: {output_path}")
-        return True
+        return img
         
     except Exception as e:
         logger.error(f"Normalization failed for {input_path}: {e}")
-        return False
+        return None
 
 
 def create_thumbnail(
     input_path: Path,
     output_path: Path,
-    size: int = 300
+    size: int = 300,
+    image: Optional[Image.Image] = None,
+    resample: Image.Resampling = Image.Resampling.BICUBIC
 ) -> bool:
-    """Create a square thumbnail from an image."""
+    """
+    Create a square thumbnail from an image.
+    Pass the already-decoded RGB image to skip reading input_path.
+    """
     try:
-        img = Image.open(input_path)
-        img = fix_orientation(img)
+        if image is not None:
+            img = image
+        else:
+            img = Image.open(input_path)
+            img = fix_orientation(img)
+            
+            if img.mode != "RGB":
+                img = img.convert("RGB")
         
-        if img.mode != "RGB":
-            img = img.convert("RGB")
+        # Create square thumbnail (crop to center). fit() resizes straight
+        # from the center box instead of copying out the crop first.
+        img = ImageOps.fit(img, (size, size), method=resample)
+        
+        img.save(output_path, "JPEG", quality=85)
+        logger.debug(f"Thumbnail created: {output_path}")
+        return True
         
-        # Create square thumbnail (crop to center)
-        width, height = img.size
+    except Exception as e:
+        logger.error(f"Thumbnail creation failed for {input_path}: {e}")
+        return False
+
+
+def create_thumbnail_from_array(
+    bgr: np.ndarray,
+    output_path: Path,
+    size: int = 300
+) -> bool:
+    """
+    Create a square thumbnail from a decoded BGR array using OpenCV.
+    The center crop is a view, and INTER_AREA is a vectorized box filter
+    well suited to large downscales.
+    """
+    try:
+        height, width = bgr.shape[:2]
         min_dim = min(width, height)
-        left = (width - min_dim) // 2
         top = (height - min_dim) // 2
-        right = left + min_dim
-        bottom = top + min_dim
+        left = (width - min_dim) // 2
         
-        img = img.crop((left, top, right, bottom))
-        img = img.resize((size, size), Image.LANCZOS)
+        thumb = cv2.resize(
+            bgr[top:top + min_dim, left:left + min_dim], (size, size),
+            interpolation=cv2.INTER_AREA
+        )
         
-        img.save(output_path, "JPEG", quality=85)
+        # imencode + tofile instead of imwrite, which can't open non-ASCII
+        # paths on Windows
+        ok, buffer = cv2.imencode(".jpg", thumb, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        buffer.tofile(str(output_path))
         logger.debug(f"Thumbnail created: {output_path}")
         return True
         
     except Exception as e:
-        logger.error(f"Thumbnail creation failed for {input_path}: {e}")
+        logger.error(f"Thumbnail creation failed for {output_path}: {e}")
         return False
 
 
+@lru_cache(maxsize=None)
+def _thumbnail_filter(name: str) -> Image.Resampling:
+    """Map a THUMBNAIL_FILTER name to a Pillow filter, defaulting to bicubic."""
+    try:
+        return Image.Resampling[name.upper()]
+    except KeyError:
+        logger.warning(f"Unknown thumbnail filter '{name}', using bicubic")
+        return Image.Resampling.BICUBIC
+
+
+def _get_io_pool(config) -> ThreadPoolExecutor:
+    """Get the shared image I/O pool, one thread per processing worker."""
+    global _io_pool
+    if _io_pool is None:
+        with _io_pool_lock:
+            if _io_pool is None:
+                _io_pool = ThreadPoolExecutor(
+                    max_workers=config.worker_count,
+                    thread_name_prefix="ImageIO"
+                )
+    return _io_pool
+
+
 # Minimum dimension for reliable face detection (InsightFace det_size is 640x640)
 _MIN_DETECT_DIM = 640
 
 
-def detect_faces(image_path: Path) -> List[DetectedFace]:
+def detect_faces(image_path: Path, image: Optional[np.ndarray] = None) -> List[DetectedFace]:
     """
     Detect faces in an image and extract embeddings using InsightFace.
     Upscales small images to ensure the face detector can find faces.
+    Pass the already-decoded BGR array to skip reading image_path.
     Returns list of DetectedFace objects.
     """
     try:
         analyzer = _get_face_analyzer()
         
         # Read image with OpenCV (BGR format)
-        img = cv2.imread(str(image_path))
+        img = image if image is not None else cv2.imread(str(image_path))
         if img is None:
             logger.error(f"Could not read image: {image_path}")
             return []
@@ -303,32 +402,24 @@ def detect_faces(image_path: Path) -> List[DetectedFace]:
         faces = analyzer.get(img)
         
         detected = []
-        for face in faces:
-            # Get bounding box (InsightFace returns [x1, y1, x2, y2])
-            bbox = face.bbox.astype(float)
-            x1, y1, x2, y2 = bbox
+        if faces:
+            # Bounding boxes for all faces at once (InsightFace returns [x1, y1, x2, y2])
+            boxes = np.stack([face.bbox for face in faces]).astype(float)
             
-            # Scale bounding box back to original image coordinates
+            # Scale bounding boxes back to original image coordinates
             if scale_factor != 1.0:
-                x1 /= scale_factor
-                y1 /= scale_factor
-                x2 /= scale_factor
-                y2 /= scale_factor
-            
-            width = x2 - x1
-            height = y2 - y1
+                boxes /= scale_factor
             
-            # Get embedding (512-dimensional)
-            embedding = face.embedding
+            # [x1, y1, x2, y2] -> [x, y, width, height], truncated like int()
+            boxes[:, 2:] -= boxes[:, :2]
+            boxes = boxes.astype(int).tolist()
             
-            # Get detection confidence
-            confidence = float(face.det_score)
-            
-            detected.append(DetectedFace(
-                bbox=(int(x1), int(y1), int(width), int(height)),
-                embedding=embedding,
-                confidence=confidence
-            ))
+            for face, box in zip(faces, boxes):
+                detected.append(DetectedFace(
+                    bbox=tuple(box),
+                    embedding=face.embedding,  # 512-dimensional
+                    confidence=float(face.det_score)
+                ))
         
         logger.debug(f"Detected {len(detected)} faces in {image_path.name}")
         return detected
@@ -372,8 +463,9 @@ def process_photo(
         processed_path = processed_dir / f"{base_name}.jpg"
         thumbnail_path = processed_dir / f"{base_name}_thumb.jpg"
         
-        # Step 1: Normalize image
-        if not normalize_image(input_path, processed_path, config.max_image_size):
+        # Step 1: Normalize image, keeping the pixels for the next two steps
+        img = _normalize(input_path, processed_path, config.max_image_size)
+        if img is None:
             return ProcessingResult(
                 success=False,
                 processed_path=None,
@@ -382,13 +474,28 @@ def process_photo(
                 error="Normalization failed"
             )
         
-        # Step 2: Create thumbnail
-        if not create_thumbnail(processed_path, thumbnail_path, config.thumbnail_size):
-            logger.warning(f"Thumbnail creation failed for {input_path}")
-            # Continue anyway, thumbnail is not critical
+        # InsightFace and OpenCV work in BGR
+        bgr = cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR)
+        
+        # Step 2: Create thumbnail on the I/O pool. OpenCV and Pillow release
+        # the GIL while resizing and encoding, so it overlaps with detection.
+        io_pool = _get_io_pool(config)
+        if config.thumbnail_filter == "area":
+            thumbnail_done = io_pool.submit(
+                create_thumbnail_from_array, bgr, thumbnail_path, config.thumbnail_size
+            )
+        else:
+            thumbnail_done = io_pool.submit(
+                create_thumbnail, processed_path, thumbnail_path, config.thumbnail_size, img,
+                _thumbnail_filter(config.thumbnail_filter)
+            )
         
         # Step 3: Detect faces
-        faces = detect_faces(processed_path)
+        faces = detect_faces(processed_path, image=bgr)
+        
+        if not thumbnail_done.result():
+            logger.warning(f"Thumbnail creation failed for {input_path}")
+            # Continue anyway, thumbnail is not critical
         
         return ProcessingResult(
             success=True,
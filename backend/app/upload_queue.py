@@ -144,9 +144,9 @@ class UploadQueueManager:
                     thread_name_prefix="Uploader"
                 ) as pool:
                     while not self._stop_event.is_set():
-                        # Fetch pending + retryable failed uploads
-                        # Fetch a generous batch — the pool will work through them
-                        pending = self.db.get_pending_uploads(
+                        # Claim pending + fetch retryable failed uploads
+                        # Claim a generous batch — the pool will work through them
+                        pending = self.db.claim_pending_uploads(
                             limit=self.config.upload_workers * 4
                         )
                         failed = self.db.get_failed_uploads(
@@ -170,8 +170,11 @@ class UploadQueueManager:
                         # Apply retry delay for failed items before submitting them
                         # We do this by wrapping them in a delayed callable
                         futures = {}
-                        for upload in all_uploads:
+                        for i, upload in enumerate(all_uploads):
                             if self._stop_event.is_set():
+                                # Hand back the rows we claimed but never started
+                                for skipped in all_uploads[i:]:
+                                    self._release_claim(skipped)
                                 break
                             
                             # For failed (retry) uploads, calculate back-off delay
@@ -237,9 +240,24 @@ class UploadQueueManager:
             # Respect stop event during the delay
             self._stop_event.wait(timeout=delay_seconds)
         if self._stop_event.is_set():
+            self._release_claim(upload)
             return False
         return self._upload_file(upload)
     
+    def _release_claim(self, upload: dict) -> None:
+        """Put a claimed upload that was never started back to 'pending'.
+        
+        Without this it would sit in 'uploading' until the stuck-upload
+        timeout, so a quick restart wouldn't pick it up.
+        """
+        # Retries from get_failed_uploads were never claimed; leave them 'failed'
+        if upload.get('status') != 'uploading':
+            return
+        try:
+            self.db.update_upload_status(upload['id'], 'pending')
+        except Exception as e:
+            logger.warning(f"Upload {upload['id']}: could not release claim: {e}")
+    
     def _upload_file(self, upload: dict) -> bool:
         """Upload a single file from the queue. Returns True on success."""
         upload_id = upload['id']
@@ -267,8 +285,9 @@ class UploadQueueManager:
             return False
         
         try:
-            # Mark as uploading
-            self.db.update_upload_status(upload_id, 'uploading')
+            # Mark as uploading (pending uploads were already claimed as such)
+            if upload['status'] != 'uploading':
+                self.db.update_upload_status(upload_id, 'uploading')
             
             # Perform upload
             success = self.cloud.upload_file(local_path, relative_to)
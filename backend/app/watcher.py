@@ -98,14 +98,12 @@ class PhotoEventHandler(FileSystemEventHandler):
             file_hash = compute_file_hash(file_path)
             db = get_db()
             
-            # Check if already processed
-            if db.photo_exists(file_hash):
+            # Create photo record unless already processed, then enqueue
+            photo_id, created = db.upsert_photo(file_hash, str(file_path))
+            if not created:
                 logger.debug(f"Already processed, skipping: {file_path}")
-                self._pending_files.discard(file_path)
                 return
             
-            # Create photo record and enqueue
-            photo_id = db.create_photo(file_hash, str(file_path))
             self.job_queue.put((photo_id, file_path, file_hash))
             
             # Track progress for user feedback
@@ -185,12 +183,15 @@ class DirectoryScanner(Thread):
             try:
                 file_hash = compute_file_hash(file_path)
                 
-                # Skip if already in database
+                # Skip if already in database. Re-scans mostly see known files,
+                # so probe with a cheap read before taking the write path.
                 if db.photo_exists(file_hash):
                     continue
                 
-                # Create photo record and enqueue
-                photo_id = db.create_photo(file_hash, str(file_path))
+                # Create photo record and enqueue (may lose a race to the event handler)
+                photo_id, created = db.upsert_photo(file_hash, str(file_path))
+                if not created:
+                    continue
                 self.job_queue.put((photo_id, file_path, file_hash))
                 enqueued += 1
                 logger.info(f"Scanner found: {file_path.name} (ID: {photo_id})")
@@ -158,19 +158,18 @@ def process_single_photo(
         
         # Step 4: Cluster faces and assign to persons
         person_ids = []
-        for face in result.faces:
-            # Store face in database
-            face_id = db.create_face(
-                photo_id=photo_id,
-                bbox=face.bbox,
-                embedding=face.embedding,
-                confidence=face.confidence
+        # Store faces and their assignments in one transaction, so a crash can't
+        # leave unassigned faces behind and centroid updates can't interleave
+        with db.transaction():
+            for face in result.faces:
+                # Assign to person cluster
+                person_ids.append(assign_person(face.embedding, config.cluster_threshold))
+            # Insert every face with its person already set: one executemany, no per-face UPDATE
+            db.create_faces_bulk(
+                photo_id,
+                [(face.bbox, face.embedding, face.confidence) for face in result.faces],
+                person_ids
             )
-            
-            # Assign to person cluster
-            person_id = assign_person(face.embedding, config.cluster_threshold)
-            db.update_face_person(face_id, person_id)
-            person_ids.append(person_id)
         
         # Route photo to appropriate folders
         cloud = get_cloud()
@@ -191,20 +190,21 @@ def process_single_photo(
             try:
                 routed_paths = route_photo(photo_id, result.processed_path, person_ids, config)
                 
-                # Queue uploads for background processing
+                # Queue uploads and mark the photo completed in one commit
                 upload_queue = get_upload_queue()
-                if upload_queue.config.upload_queue_enabled and upload_queue.cloud.is_enabled:
-                    for path in routed_paths:
-                        upload_queue.enqueue(photo_id, path, config.event_root)
-                    logger.debug(f"Queued {len(routed_paths)} files for upload")
-                
-                db.update_photo_processing(
-                    photo_id,
-                    str(result.processed_path),
-                    str(result.thumbnail_path) if result.thumbnail_path else "",
-                    len(result.faces),
-                    "completed"
-                )
+                with db.transaction():
+                    if upload_queue.config.upload_queue_enabled and upload_queue.cloud.is_enabled:
+                        for path in routed_paths:
+                            upload_queue.enqueue(photo_id, path, config.event_root)
+                        logger.debug(f"Queued {len(routed_paths)} files for upload")
+                    
+                    db.update_photo_processing(
+                        photo_id,
+                        str(result.processed_path),
+                        str(result.thumbnail_path) if result.thumbnail_path else "",
+                        len(result.faces),
+                        "completed"
+                    )
             except Exception as routing_error:
                 logger.error(f"Routing failed for {file_path.name}: {routing_error}")
                 # Still mark as completed in DB since faces were detected and stored
@@ -291,10 +291,13 @@ def worker_loop(
             # This MUST happen regardless of success/failure so the batch counter
             # advances and the upload phase eventually triggers.
             coordinator.on_photo_processed()
-            batch_status = coordinator.get_status()
-            logger.debug(
-                f"[{thread_name}] Batch progress: {batch_status['photos_in_batch']}/{batch_status['batch_size']}"
-            )
+            # Only build the status snapshot (and take the coordinator lock)
+            # when the debug line will actually be emitted
+            if logger.isEnabledFor(logging.DEBUG):
+                batch_status = coordinator.get_status()
+                logger.debug(
+                    f"[{thread_name}] Batch progress: {batch_status['photos_in_batch']}/{batch_status['batch_size']}"
+                )
             
             job_queue.task_done()
             
@@ -382,19 +385,20 @@ def main():
     # Resume pending photos from previous session
     # After a restart the in-memory queue is empty, but the DB may still
     # contain photos in 'pending' status that were never processed.
-    pending_photos = db.get_pending_photos()
-    if pending_photos:
-        logger.info(f"Resuming {len(pending_photos)} pending photo(s) from previous session")
-        for photo in pending_photos:
-            file_path = Path(photo.original_path)
-            if file_path.exists():
-                job_queue.put((photo.id, file_path, photo.file_hash))
-                progress.on_enqueue()
-            else:
-                logger.warning(
-                    f"Skipping resume for photo {photo.id}: "
-                    f"original file no longer exists at {photo.original_path}"
-                )
+    resumed = 0
+    for photo in db.iter_pending_photos():
+        resumed += 1
+        file_path = Path(photo.original_path)
+        if file_path.exists():
+            job_queue.put((photo.id, file_path, photo.file_hash))
+            progress.on_enqueue()
+        else:
+            logger.warning(
+                f"Skipping resume for photo {photo.id}: "
+                f"original file no longer exists at {photo.original_path}"
+            )
+    if resumed:
+        logger.info(f"Resuming {resumed} pending photo(s) from previous session")
         logger.info(f"Re-queued {job_queue.qsize()} photo(s) for processing")
     
     # Start upload queue
@@ -454,9 +458,16 @@ def main():
                     try:
                         stuck_count = db.reset_stuck_processing_live(timeout_minutes=10)
                         if stuck_count > 0:
-                            logger.warning(f"Recovered {stuck_count} stuck processing photo(s)")
+                            logger.warning(f"Reset {stuck_count} photo(s) stuck in 'processing' for >10min back to 'pending'")
                     except Exception as e:
                         logger.error(f"Failed to check for stuck processing: {e}")
+                
+                # Keep planner statistics fresh as tables grow (~every hour)
+                if main_loop_count % 720 == 0:
+                    try:
+                        db.optimize()
+                    except Exception as e:
+                        logger.error(f"Failed to optimize database: {e}")
                         
         except KeyboardInterrupt:
             logger.info("Keyboard interrupt received")
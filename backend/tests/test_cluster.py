@@ -10,6 +10,7 @@ from pathlib import Path
 from app.cluster import (
     cosine_distance,
     euclidean_distance,
+    find_nearest_centroid,
     find_nearest_person,
     update_centroid,
     assign_person,
@@ -194,6 +195,26 @@ class TestFindNearestPerson:
         nearest, distance = find_nearest_person(embedding, persons)
         
         assert nearest.id == 2  # The similar one
+    
+    def test_centroid_matrix(self):
+        """Should match cosine_distance row by row and skip zero centroids."""
+        embedding = np.array([1.0, 0.0, 0.0])
+        centroids = np.array([
+            [0.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0],
+            [0.9, 0.1, 0.0],
+        ])
+        
+        index, distance = find_nearest_centroid(embedding, centroids)
+        
+        assert index == 2
+        assert distance == pytest.approx(cosine_distance(embedding, centroids[2]))
+        assert find_nearest_centroid(embedding, np.empty((0, 3))) == (-1, float("inf"))
+        
+        unit_rows = centroids[1:] / np.linalg.norm(centroids[1:], axis=1, keepdims=True)
+        index, unit_distance = find_nearest_centroid(embedding, unit_rows, normalized=True)
+        assert index == 1
+        assert unit_distance == pytest.approx(distance)
 
 
 if __name__ == "__main__":
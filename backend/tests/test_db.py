@@ -55,6 +55,16 @@ class TestDatabaseIdempotency:
         # Should exist now
         assert db.photo_exists(file_hash) is True
     
+    def test_upsert_photo_is_idempotent(self, db):
+        """upsert_photo should create once and return the existing ID afterwards."""
+        photo_id, created = db.upsert_photo("abc123def456", "/path/to/photo1.jpg")
+        assert created is True
+        
+        same_id, created = db.upsert_photo("abc123def456", "/path/to/photo2.jpg")
+        assert created is False
+        assert same_id == photo_id
+        assert db.get_photo_by_hash("abc123def456").original_path == "/path/to/photo1.jpg"
+    
     def test_processing_status_tracked(self, db):
         """Photo status should be tracked correctly through processing."""
         file_hash = "abc123def456"
@@ -101,6 +111,70 @@ class TestDatabaseIdempotency:
         assert len(pending) == 1
         assert pending[0].id == 3
     
+    def test_iter_pending_photos_paginates(self, db):
+        """Iterating pending photos across several batches should yield each once, in order."""
+        for i in range(7):
+            db.create_photo(f"hash{i}", f"/path/{i}.jpg")
+        db.update_photo_status(3, "completed")
+        
+        pending = list(db.iter_pending_photos(batch_size=2))
+        assert [p.id for p in pending] == [1, 2, 4, 5, 6, 7]
+    
+    def test_startup_resets_stuck_processing(self, db):
+        """Photos left in 'processing' by a crash should be pending after restart."""
+        for i in range(4):
+            db.create_photo(f"hash{i}", f"/path/{i}.jpg")
+        for photo_id in (1, 3, 4):
+            db.update_photo_status(photo_id, "processing")
+        db.update_photo_status(4, "completed")
+        
+        db.initialize()
+        
+        assert [p.id for p in db.get_pending_photos()] == [1, 2, 3]
+    
+    def test_claim_pending_uploads(self, db):
+        """Claiming should hand each pending upload out once, oldest first."""
+        db.create_photo("hash", "/path/a.jpg")
+        ids = [db.enqueue_upload(1, f"/people/{i}.jpg", "/people") for i in range(3)]
+        
+        claimed = db.claim_pending_uploads(limit=2)
+        assert [u["id"] for u in claimed] == ids[:2]
+        assert all(u["status"] == "uploading" for u in claimed)
+        
+        assert [u["id"] for u in db.claim_pending_uploads(limit=5)] == ids[2:]
+        assert db.claim_pending_uploads(limit=5) == []
+    
+    def test_upload_stats_unique(self, db):
+        """File copies and unique photos should be counted per status."""
+        db.create_photo("hash1", "/path/a.jpg")
+        db.create_photo("hash2", "/path/b.jpg")
+        db.enqueue_upload(1, "/people/x/a.jpg", "/people")
+        db.enqueue_upload(1, "/people/y/a.jpg", "/people")
+        done = db.enqueue_upload(2, "/people/x/b.jpg", "/people")
+        db.update_upload_status(done, "completed")
+        
+        assert db.get_upload_stats_unique() == {
+            'by_status': {'pending': 2, 'completed': 1},
+            'unique_by_status': {'pending': 1, 'completed': 1},
+        }
+    
+    def test_live_reset_only_touches_stale_rows(self, db):
+        """Live resets should only requeue photos/uploads stuck past the timeout."""
+        for i in range(3):
+            db.create_photo(f"hash{i}", f"/path/{i}.jpg")
+            db.update_photo_status(i + 1, "processing")
+        conn = db.connect()
+        conn.execute("UPDATE photos SET created_at = datetime('now', '-1 hour') WHERE id = 1")
+        
+        upload_id = db.enqueue_upload(1, "/people/a.jpg", "/people")
+        db.update_upload_status(upload_id, "uploading")
+        assert db.reset_stuck_uploads(timeout_minutes=5) == 0
+        conn.execute("UPDATE upload_queue SET updated_at = datetime('now', '-1 hour')")
+        
+        assert db.reset_all_stuck(upload_timeout=5, processing_timeout=10) == (1, 1)
+        assert [p.id for p in db.get_pending_photos()] == [1]
+        assert db.reset_stuck_uploads(timeout_minutes=5) == 0
+    
     def test_error_status_persists(self, db):
         """Error status should persist and not be reprocessed."""
         file_hash = "corrupt_file_hash"
@@ -154,6 +228,63 @@ class TestDatabaseCRUD:
         assert person.face_count == 1
         np.testing.assert_array_equal(person.centroid, centroid)
     
+    def test_create_person_auto_name(self, db):
+        """Unnamed persons should be numbered after their own ID."""
+        import numpy as np
+        
+        centroid = np.random.randn(512).astype(np.float32)
+        first_id = db.create_person("Person_001", centroid)
+        assert db.get_next_person_number() == first_id + 1
+        
+        person_id = db.create_person(None, centroid)
+        assert person_id == first_id + 1
+        assert db.get_person_by_id(person_id).name == f"Person_{person_id:03d}"
+        assert db.get_next_person_number() == person_id + 1
+    
+    def test_one_enrollment_per_person(self, db):
+        """A person can only be enrolled once; duplicates from old databases are pruned."""
+        import sqlite3
+        import numpy as np
+        
+        person_id = db.create_person("Person_001", np.random.randn(512).astype(np.float32))
+        first_id = db.create_enrollment(person_id, "Alice", "/selfies/a.jpg", 0.9)
+        with pytest.raises(sqlite3.IntegrityError):
+            db.create_enrollment(person_id, "Bob", "/selfies/b.jpg", 0.8)
+        
+        # Simulate a legacy database without the unique index
+        conn = db.connect()
+        conn.execute("DROP INDEX uniq_enrollments_person")
+        db.create_enrollment(person_id, "Bob", "/selfies/b.jpg", 0.8)
+        db.initialize()
+        
+        assert db.is_person_enrolled(person_id)
+        assert [e.id for e in db.get_all_enrollments()] == [first_id]
+        assert db.get_enrollment_by_person(person_id).user_name == "Alice"
+    
+    def test_transaction_groups_writes(self, db):
+        """Writes inside db.transaction() commit together or not at all."""
+        import numpy as np
+        
+        photo_id = db.create_photo("test_hash", "/test/path.jpg")
+        embedding = np.random.randn(512).astype(np.float32)
+        
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                face_ids = db.create_faces_bulk(photo_id, [((0, 0, 10, 10), embedding, 0.9)])
+                person_id = db.create_person(None, embedding)
+                db.update_face_person(face_ids[0], person_id)
+                raise RuntimeError("crash mid-pipeline")
+        
+        assert db.get_faces_count_for_photo(photo_id) == 0
+        assert db.get_all_persons_meta() == []
+        
+        with db.transaction():
+            face_ids = db.create_faces_bulk(photo_id, [((0, 0, 10, 10), embedding, 0.9)])
+            person_id = db.create_person(None, embedding)
+            db.update_face_person(face_ids[0], person_id)
+        
+        assert db.get_faces_by_photo(photo_id)[0].person_id == person_id
+    
     def test_create_face_with_embedding(self, db):
         """Should store and retrieve face embeddings correctly."""
         import numpy as np
@@ -176,6 +307,46 @@ class TestDatabaseCRUD:
         assert faces[0].confidence == pytest.approx(0.95)
         np.testing.assert_array_equal(faces[0].embedding, embedding)
     
+    def test_meta_queries_skip_vectors(self, db):
+        """Meta queries should return summaries without embeddings/centroids."""
+        import numpy as np
+        
+        photo_id = db.create_photo("test_hash", "/test/path.jpg")
+        embedding = np.random.randn(512).astype(np.float32)
+        person_id = db.create_person("Person_001", embedding)
+        db.create_face(photo_id, (1, 2, 3, 4), embedding, 0.9, person_id)
+        
+        persons = db.get_all_persons_meta()
+        assert [(p.id, p.name, p.face_count) for p in persons] == [(person_id, "Person_001", 1)]
+        assert not hasattr(persons[0], "centroid")
+        
+        faces = db.get_faces_by_photo_meta(photo_id)
+        assert len(faces) == 1
+        assert (faces[0].bbox_x, faces[0].bbox_y, faces[0].bbox_w, faces[0].bbox_h) == (1, 2, 3, 4)
+        assert faces[0].person_id == person_id
+        assert not hasattr(faces[0], "embedding")
+    
+    def test_create_faces_bulk(self, db):
+        """Bulk insert should return IDs in input order and store all faces."""
+        import numpy as np
+        
+        photo_id = db.create_photo("test_hash", "/test/path.jpg")
+        person_id = db.create_person("Person_001", np.ones(512, dtype=np.float32))
+        embeddings = [np.random.randn(512).astype(np.float32) for _ in range(3)]
+        
+        face_ids = db.create_faces_bulk(
+            photo_id,
+            [((i * 10, 0, 10, 10), emb, 0.9) for i, emb in enumerate(embeddings)],
+            person_ids=[person_id, None, person_id]
+        )
+        
+        faces = {f.id: f for f in db.get_faces_by_photo(photo_id)}
+        assert len(face_ids) == 3
+        assert [faces[fid].bbox_x for fid in face_ids] == [0, 10, 20]
+        assert [faces[fid].person_id for fid in face_ids] == [person_id, None, person_id]
+        for fid, emb in zip(face_ids, embeddings):
+            np.testing.assert_array_equal(faces[fid].embedding, emb)
+    
     def test_get_unique_persons_in_photo(self, db):
         """Should correctly identify unique persons in a photo."""
         import numpy as np
@@ -209,6 +380,156 @@ class TestDatabaseCRUD:
         person = db.get_person_by_id(person_id)
         assert person.face_count == 5
         np.testing.assert_array_equal(person.centroid, new_centroid)
+    
+    def test_get_all_centroids(self, db):
+        """Centroids should come back as one unit-row matrix in person-ID order."""
+        import numpy as np
+        
+        assert db.get_all_centroids()[1] == []
+        
+        vectors = np.random.randn(3, 512).astype(np.float32)
+        ids = [db.create_person(f"Person_{i:03d}", vector) for i, vector in enumerate(vectors)]
+        
+        centroids, person_ids = db.get_all_centroids()
+        assert person_ids == ids
+        assert centroids.shape == (3, 512)
+        np.testing.assert_allclose(
+            centroids, vectors / np.linalg.norm(vectors, axis=1, keepdims=True), rtol=1e-6
+        )
+    
+    def test_centroid_cache_follows_writes(self, db):
+        """The cached centroid matrix should track this and other connections' writes."""
+        import sqlite3
+        import numpy as np
+        
+        first = np.eye(512, dtype=np.float32)[0]
+        first_id = db.create_person("Person_001", first)
+        db.get_all_centroids()
+        
+        second = np.eye(512, dtype=np.float32)[1]
+        second_id = db.create_person("Person_002", second)
+        db.update_person_centroid(first_id, -first, face_count=2)
+        centroids, ids = db.get_all_centroids()
+        assert ids == [first_id, second_id]
+        np.testing.assert_array_equal(centroids, np.stack([-first, second]))
+        
+        db.delete_person(second_id)
+        assert db.get_all_centroids()[1] == [first_id]
+        
+        other = sqlite3.connect(db.db_path)
+        other.execute("DELETE FROM persons")
+        other.commit()
+        other.close()
+        assert db.get_all_centroids()[1] == []
+    
+    def test_person_cache_sees_renames(self, db):
+        """Cached persons should not outlive a rename, whichever connection made it."""
+        import sqlite3
+        import numpy as np
+        
+        person_id = db.create_person("Person_001", np.ones(512, dtype=np.float32))
+        assert db.get_person_by_id(person_id) is db.get_person_by_id(person_id)
+        
+        db.update_person_name(person_id, "Alice")
+        assert db.get_person_by_id(person_id).name == "Alice"
+        
+        # e.g. the web server enrolling someone from its own process
+        other = sqlite3.connect(db.db_path)
+        other.execute("UPDATE persons SET name = 'Bob' WHERE id = ?", (person_id,))
+        other.commit()
+        other.close()
+        assert db.get_person_by_id(person_id).name == "Bob"
+    
+    def test_cleanup_orphaned_faces_recalculates_persons(self, db):
+        """Crash cleanup should drop empty persons and recompute surviving centroids."""
+        import numpy as np
+        
+        kept_photo = db.create_photo("kept_hash", "/test/kept.jpg")
+        crashed_photo = db.create_photo("crashed_hash", "/test/crashed.jpg")
+        
+        a = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+        b = np.array([0.0, 1.0, 0.0], dtype=np.float32)
+        shared_id = db.create_person("Person_001", a)
+        orphan_id = db.create_person("Person_002", b)
+        
+        db.create_face(kept_photo, (0, 0, 10, 10), a, 0.9, shared_id)
+        db.create_face(crashed_photo, (0, 0, 10, 10), b, 0.9, shared_id)
+        db.create_face(crashed_photo, (20, 0, 10, 10), b, 0.9, orphan_id)
+        db.update_person_centroid(shared_id, (a + b) / np.linalg.norm(a + b), face_count=2)
+        
+        db._cleanup_orphaned_faces([crashed_photo])
+        
+        assert db.get_faces_count_for_photo(crashed_photo) == 0
+        assert db.get_person_by_id(orphan_id) is None
+        shared = db.get_person_by_id(shared_id)
+        assert shared.face_count == 1
+        np.testing.assert_allclose(shared.centroid, a)
+    
+    def test_update_upload_paths_rewrites_prefix_only(self, db, tmp_path):
+        """Renaming a person folder should only touch that folder's pending uploads."""
+        people = tmp_path / "People"
+        photo_id = db.create_photo("test_hash", "/test/path.jpg")
+        renamed = db.enqueue_upload(photo_id, str(people / "Person_001" / "Solo" / "a.jpg"), str(tmp_path))
+        similar = db.enqueue_upload(photo_id, str(people / "Person_0012" / "Solo" / "a.jpg"), str(tmp_path))
+        done = db.enqueue_upload(photo_id, str(people / "Person_001" / "Group" / "b.jpg"), str(tmp_path))
+        db.update_upload_status(done, "completed")
+        
+        assert db.update_upload_paths("Person_001", "John_Doe", people) == 1
+        
+        paths = {row[0]: row[1] for row in db.connect().execute("SELECT id, local_path FROM upload_queue")}
+        assert paths[renamed] == str(people / "John_Doe" / "Solo" / "a.jpg")
+        assert paths[similar] == str(people / "Person_0012" / "Solo" / "a.jpg")
+        assert paths[done] == str(people / "Person_001" / "Group" / "b.jpg")
+    
+    def test_legacy_bbox_columns_migrated(self, db):
+        """Four-column bboxes from older databases should be packed into one column."""
+        import numpy as np
+        
+        photo_id = db.create_photo("test_hash", "/test/path.jpg")
+        conn = db.connect()
+        conn.execute("ALTER TABLE faces RENAME COLUMN bbox TO bbox_x")
+        for column in ("bbox_y", "bbox_w", "bbox_h"):
+            conn.execute(f"ALTER TABLE faces ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+        conn.execute(
+            """INSERT INTO faces (photo_id, bbox_x, bbox_y, bbox_w, bbox_h, embedding, confidence)
+               VALUES (?, -3, 40, 120, 150, ?, 0.9)""",
+            (photo_id, np.zeros(512, dtype=np.float32).tobytes())
+        )
+        
+        assert db._migrate_bbox_columns() is True
+        assert db._migrate_bbox_columns() is False
+        
+        face = db.get_faces_by_photo(photo_id)[0]
+        assert (face.bbox_x, face.bbox_y, face.bbox_w, face.bbox_h) == (-3, 40, 120, 150)
+        
+        # New faces round-trip through the packed column as well
+        db.create_face(photo_id, (7, -2, 300, 301), np.zeros(512), 0.8)
+        summary = db.get_faces_by_photo_meta(photo_id)[1]
+        assert (summary.bbox_x, summary.bbox_y, summary.bbox_w, summary.bbox_h) == (7, -2, 300, 301)
+    
+    def test_legacy_pickled_embeddings_migrated(self, db):
+        """Pickled BLOBs from older databases should be rewritten as raw float32."""
+        import pickle
+        import numpy as np
+        
+        photo_id = db.create_photo("test_hash", "/test/path.jpg")
+        embedding = np.random.randn(512).astype(np.float32)
+        conn = db.connect()
+        conn.execute(
+            "INSERT INTO persons (name, centroid) VALUES (?, ?)",
+            ("Person_001", pickle.dumps(embedding))
+        )
+        conn.execute(
+            """INSERT INTO faces (photo_id, bbox, embedding, confidence)
+               VALUES (?, 0, ?, 0.9)""",
+            (photo_id, pickle.dumps(embedding))
+        )
+        
+        assert db._migrate_pickled_embeddings() == 2
+        assert db._migrate_pickled_embeddings() == 0
+        
+        np.testing.assert_array_equal(db.get_person_by_id(1).centroid, embedding)
+        np.testing.assert_array_equal(db.get_faces_by_photo(photo_id)[0].embedding, embedding)
 
 
 class TestDatabaseStats:
@@ -242,6 +563,62 @@ class TestDatabaseStats:
         assert stats["photos_by_status"]["completed"] == 2
         assert stats["photos_by_status"]["pending"] == 1
 
+    
+    def test_read_pool_connections_are_read_only(self, populated_db):
+        """Pooled stats connections should be reused and refuse writes."""
+        import sqlite3
+        
+        with populated_db._read_conn() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM photos")
+        with populated_db._read_conn() as again:
+            assert again is conn
+        
+        populated_db.update_photo_status(3, "completed")
+        assert populated_db.get_stats()["photos_by_status"] == {"completed": 3}
+    
+    def test_stats_counters_follow_writes(self, populated_db):
+        """Face/person/enrollment totals should track inserts and deletes, including cascades."""
+        import numpy as np
+        
+        db = populated_db
+        embedding = np.random.randn(512).astype(np.float32)
+        person_id = db.create_person(None, embedding)
+        db.create_faces_bulk(1, [((0, 0, 10, 10), embedding, 0.9)] * 3, [person_id] * 3)
+        db.create_face(2, (0, 0, 10, 10), embedding, 0.9, person_id)
+        db.create_enrollment(person_id, "Alice", "/selfies/a.jpg", 0.9)
+        
+        stats = db.get_stats()
+        assert (stats["total_faces"], stats["total_persons"], stats["total_enrollments"]) == (4, 1, 1)
+        
+        # Deleting a photo cascades to its faces
+        db.connect().execute("DELETE FROM photos WHERE id = 1")
+        assert db.get_stats()["total_faces"] == 1
+        
+        # Counters are rebuilt from the tables on startup
+        db.connect().execute("UPDATE stats_counters SET value = 99")
+        db.initialize()
+        stats = db.get_stats()
+        assert (stats["total_faces"], stats["total_persons"], stats["total_enrollments"]) == (1, 1, 1)
+    
+    def test_enrollment_overview(self, populated_db):
+        """Person total and enrollments should come back together, even with no enrollments."""
+        import numpy as np
+        
+        db = populated_db
+        assert db.get_enrollment_overview() == (0, [])
+        
+        embedding = np.random.randn(512).astype(np.float32)
+        alice = db.create_person(None, embedding)
+        bob = db.create_person(None, embedding)
+        db.create_person(None, embedding)
+        db.create_enrollment(alice, "Alice", "/selfies/a.jpg", 0.9)
+        db.create_enrollment(bob, "Bob", "/selfies/b.jpg", 0.8)
+        
+        total_persons, enrollments = db.get_enrollment_overview()
+        assert total_persons == 3
+        assert enrollments == db.get_all_enrollments()
+        assert [e.user_name for e in enrollments] == ["Bob", "Alice"]
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
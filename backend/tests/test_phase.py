@@ -0,0 +1,77 @@
+"""
+Unit tests for the phase coordinator.
+"""
+
+import pytest
+
+from app.phase import PhaseCoordinator, Phase
+
+
+class TestPhaseCoordinator:
+    """Tests for batch counting and phase switching."""
+    
+    @pytest.fixture
+    def coordinator(self, monkeypatch):
+        """Create a coordinator with a small batch size."""
+        monkeypatch.setenv("PROCESS_BATCH_SIZE", "3")
+        return PhaseCoordinator()
+    
+    def test_batch_switches_to_uploading(self, coordinator):
+        """The batch-size-th photo should switch to UPLOADING, and completing uploads resets the count."""
+        coordinator.on_photo_processed()
+        coordinator.on_photo_processed()
+        assert coordinator.current_phase == Phase.PROCESSING
+        assert coordinator.photos_in_current_batch == 2
+        
+        coordinator.on_photo_processed()
+        assert coordinator.current_phase == Phase.UPLOADING
+        
+        coordinator.on_uploads_complete()
+        assert coordinator.current_phase == Phase.PROCESSING
+        assert coordinator.photos_in_current_batch == 0
+        
+        coordinator.on_photo_processed()
+        assert coordinator.photos_in_current_batch == 1
+    
+    def test_status_polling_does_not_delay_switch(self, coordinator):
+        """A status poll landing inside a worker's count update must not make the batch fill later."""
+        ticks = coordinator._counter
+        
+        class PollingCounter:
+            """Polls the status between drawing a tick and the worker using it."""
+            def __next__(self):
+                tick = next(ticks)
+                coordinator.get_status()
+                coordinator.photos_in_current_batch
+                return tick
+        
+        coordinator._counter = PollingCounter()
+        for _ in range(2):
+            coordinator.on_photo_processed()
+        assert coordinator.current_phase == Phase.PROCESSING
+        assert coordinator.get_status()["photos_in_batch"] == 2
+        
+        coordinator.on_photo_processed()
+        assert coordinator.current_phase == Phase.UPLOADING
+        assert coordinator.get_status()["photos_in_batch"] == 3
+
+    def test_out_of_order_workers_do_not_lower_count(self, coordinator):
+        """A slower worker storing an older tick must not move the count backwards."""
+        ticks = coordinator._counter
+
+        class OvertakingCounter:
+            """Lets another worker draw and store a tick before this one stores its own."""
+            overtaken = False
+            def __next__(self):
+                tick = next(ticks)
+                if not self.overtaken:
+                    self.overtaken = True
+                    coordinator.on_photo_processed()
+                return tick
+
+        coordinator._counter = OvertakingCounter()
+        coordinator.on_photo_processed()
+        assert coordinator.photos_in_current_batch == 2
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,8 +1,12 @@
+import sys
 import sqlite3
-import pickle
 import numpy as np
 from pathlib import Path
 
+# Use the backend's embedding codec (raw or Blosc-compressed float32)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+from app.db import _blob_to_emb, _emb_to_blob
+
 db_path = Path("data/wedding.db")
 conn = sqlite3.connect(db_path)
 conn.row_factory = sqlite3.Row
@@ -12,9 +16,9 @@ print("Analyzing database for duplicate faces...")
 
 # Group faces by photo and coordinates
 cursor.execute("""
-    SELECT photo_id, bbox_x, bbox_y, bbox_w, bbox_h, COUNT(*) as count
+    SELECT photo_id, bbox, COUNT(*) as count
     FROM faces
-    GROUP BY photo_id, bbox_x, bbox_y, bbox_w, bbox_h
+    GROUP BY photo_id, bbox
     HAVING count > 1
 """)
 duplicates = cursor.fetchall()
@@ -31,9 +35,9 @@ else:
         # Get all face IDs for this coordinate set
         cursor.execute("""
             SELECT id, person_id FROM faces
-            WHERE photo_id = ? AND bbox_x = ? AND bbox_y = ? AND bbox_w = ? AND bbox_h = ?
+            WHERE photo_id = ? AND bbox = ?
             ORDER BY id
-        """, (dup['photo_id'], dup['bbox_x'], dup['bbox_y'], dup['bbox_w'], dup['bbox_h']))
+        """, (dup['photo_id'], dup['bbox']))
         
         face_rows = cursor.fetchall()
         # Keep the first one, delete the rest
@@ -59,14 +63,14 @@ else:
             # Also recalculate centroid while we are at it
             cursor.execute("SELECT embedding FROM faces WHERE person_id = ?", (person_id,))
             embeddings_blobs = cursor.fetchall()
-            embeddings = [pickle.loads(row[0]) for row in embeddings_blobs]
+            embeddings = [_blob_to_emb(row[0]) for row in embeddings_blobs]
             
             new_centroid = np.mean(embeddings, axis=0)
             norm = np.linalg.norm(new_centroid)
             if norm > 0:
                 new_centroid = new_centroid / norm
             
-            centroid_blob = pickle.dumps(new_centroid)
+            centroid_blob = _emb_to_blob(new_centroid)
             cursor.execute("UPDATE persons SET face_count = ?, centroid = ? WHERE id = ?", 
                            (actual_count, centroid_blob, person_id))
             print(f"Updated Person {person_id}: New Face Count = {actual_count}")
@@ -27,7 +27,7 @@ sys.path.insert(0, str(backend_path))
 
 from app.config import get_config
 from app.db import get_db
-from app.enrollment import enroll_user, get_enrollment_status, EnrollmentResult
+from app.enrollment import enroll_user, EnrollmentResult
 
 # Setup logging
 logging.basicConfig(
@@ -99,13 +99,12 @@ async def get_stats():
     try:
         db = get_db()
         stats = db.get_stats()
-        enrollment_status = get_enrollment_status()
         
         return StatsResponse(
             total_photos=sum(stats.get("photos_by_status", {}).values()),
             total_faces=stats.get("total_faces", 0),
             total_persons=stats.get("total_persons", 0),
-            total_enrolled=enrollment_status.get("total_enrolled", 0),
+            total_enrolled=stats.get("total_enrollments", 0),
             photos_by_status=stats.get("photos_by_status", {})
         )
     except Exception as e:
@@ -311,7 +310,7 @@ async def list_persons():
     db = get_db()
     config = get_config()
     
-    persons = db.get_all_persons()
+    persons = db.get_all_persons_meta()
     enrollments = {e.person_id: e for e in db.get_all_enrollments()}
     
     result = []